@@ -15,9 +15,18 @@ class OllamaConfig(BaseModel):
     base_url: str = Field(default="http://localhost:11434")
     model: str = Field(default="llama3.1:8b")
     timeout: float = Field(default=120.0)
+    # How long Ollama keeps the model loaded after a request (Ollama's default is 5m)
+    keep_alive: str = Field(default="30m")
     # Seed for reproducible outputs. If set, the same input will produce the same output.
     # Set to None for random (non-deterministic) behaviour.
     seed: int | None = Field(default=None)
+    # Reuse final responses for repeated opening prompts. Only applies when a seed
+    # is set (deterministic output) and the conversation is empty.
+    cache_enabled: bool = Field(default=False)
+    # Maximum number of conversation messages sent to the model. Older messages are
+    # dropped (the first user message is always kept). 0 keeps the full history;
+    # other windows below 2 are treated as 2, so the latest reply is never dropped.
+    history_window: int = Field(default=16, ge=0)
 
 
 class OnePasswordConfig(BaseModel):
@@ -30,6 +39,12 @@ class OnePasswordConfig(BaseModel):
     vault: str = Field(default="SecureTools")
     # Optional: specify service account token via env
     service_account_token: str | None = Field(default=None)
+    # Maximum number of `op read` processes run at once when secrets are read
+    # individually (lower it if 1Password starts rate limiting)
+    max_concurrent_reads: int = Field(default=8)
+    # How long a fetched secret is reused before being read again from 1Password,
+    # so rotated secrets are picked up by long-running sessions
+    cache_ttl_seconds: float = Field(default=300.0)
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -4,27 +4,60 @@ Secure Tool Runner - Main Entry Point
 A secure tool access layer between Ollama LLMs and authenticated services.
 """
 
+import atexit
+from functools import cache
+from typing import TYPE_CHECKING
+
 import typer
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.panel import Panel
-from rich.prompt import Prompt
 
 from .config import config
-from .orchestrator import Orchestrator
-from .secrets_broker import SecretsBroker
-from .tools.setup import setup_tools
+
+# Heavier modules (httpx, the orchestrator, tool setup, rich widgets only `chat`
+# uses) are imported inside the commands that need them, so `help` and
+# `list-tools` start quickly
+if TYPE_CHECKING:
+    import httpx
+
+    from .orchestrator import Orchestrator
 
 app = typer.Typer(
     name="secure-tools", help="Secure Tool Runner - Secure LLM tool execution with 1Password"
 )
 console = Console()
 
+# Timeout for requests made by the diagnostic commands
+HTTP_TIMEOUT_SECONDS = 10
+
+
+@cache
+def _http_client() -> "httpx.Client":
+    """
+    HTTP client shared by the diagnostic commands.
+
+    Created on first use so commands that don't make requests never pay for
+    it, and kept alive so repeated requests reuse pooled connections.
+    Per-request timeouts can still be passed to client.get(..., timeout=...).
+    """
+    import httpx
 
-def create_orchestrator(vault: str = "SecureTools", require_secrets: bool = False) -> Orchestrator:
+    client = httpx.Client(timeout=HTTP_TIMEOUT_SECONDS, limits=httpx.Limits(keepalive_expiry=30))
+    atexit.register(client.close)
+    return client
+
+
+def create_orchestrator(
+    vault: str = "SecureTools", require_secrets: bool = False
+) -> "Orchestrator":
     """Create and configure the orchestrator with all components."""
-    # Create the secrets broker (trusted boundary)
-    broker = SecretsBroker(require_secrets=require_secrets)
+    from .orchestrator import Orchestrator
+    from .secrets_broker import SecretsBroker
+    from .tools.setup import setup_tools
+
+    # Create the secrets broker (trusted boundary). Live mode needs every secret
+    # anyway, so they are fetched in the background as tools register.
+    broker = SecretsBroker(require_secrets=require_secrets, warm_on_register=require_secrets)
 
     # Register tools with their secret requirements
     setup_tools(broker, vault=vault)
@@ -32,9 +65,65 @@ def create_orchestrator(vault: str = "SecureTools", require_secrets: bool = Fals
     # Create the orchestrator (LLM-facing, untrusted)
     orchestrator = Orchestrator(broker)
 
+    # Start loading the model so the first turn doesn't pay for it
+    orchestrator.start_warmup()
+
     return orchestrator
 
 
+class _StreamingReply:
+    """
+    Assistant reply that is still streaming in.
+
+    Fragments are only appended as they arrive; the Markdown is parsed when
+    Live refreshes, and only if new text came in since the last refresh.
+    """
+
+    def __init__(self) -> None:
+        self._fragments: list[str] = []
+        self._rendered: tuple[int, Panel] | None = None
+
+    def append(self, fragment: str) -> None:
+        self._fragments.append(fragment)
+
+    def __rich__(self) -> Panel:
+        # Live refreshes from its own thread, so key the cached panel on the
+        # fragment count it was built from rather than resetting it on append
+        count = len(self._fragments)
+        if self._rendered is None or self._rendered[0] != count:
+            from rich.markdown import Markdown
+
+            text = "".join(self._fragments[:count])
+            panel = Panel(Markdown(text), title="Assistant", border_style="green")
+            self._rendered = (count, panel)
+        return self._rendered[1]
+
+
+def _chat_turn(orchestrator: "Orchestrator", message: str) -> str:
+    """Run one chat turn, rendering the assistant's reply as it streams in."""
+    from rich.live import Live
+    from rich.markdown import Markdown
+    from rich.spinner import Spinner
+
+    reply = _StreamingReply()
+
+    with Live(
+        Spinner("dots", text="[bold cyan]Thinking...[/bold cyan]"),
+        console=console,
+        refresh_per_second=8,
+    ) as live:
+
+        def render(fragment: str) -> None:
+            # Only swaps the renderable in; Live parses it on its next refresh
+            reply.append(fragment)
+            live.update(reply)
+
+        response = orchestrator.chat(message, on_content=render)
+        live.update(Panel(Markdown(response), title="Assistant", border_style="green"))
+
+    return response
+
+
 @app.command()
 def chat(
     vault: str = typer.Option(
@@ -50,6 +139,9 @@ def chat(
     seed: int | None = typer.Option(
         None, "--seed", help="Random seed for reproducible outputs (same seed = same response)"
     ),
+    cache: bool = typer.Option(
+        False, "--cache", help="Reuse responses to repeated opening messages (requires --seed)"
+    ),
 ):
     """
     Start an interactive chat session with tool support.
@@ -59,11 +151,21 @@ def chat(
 
     Use --live to require real 1Password secrets (fails if unavailable).
     """
+    from rich.prompt import Prompt
+
     # Update config
     config.ollama.model = model
     config.ollama.seed = seed
+    config.ollama.cache_enabled = cache
     config.onepassword.vault = vault
 
+    # Create the orchestrator first so the model warms up while the banner is read
+    try:
+        orchestrator = create_orchestrator(vault=vault, require_secrets=live)
+    except Exception as e:
+        console.print(f"[red]Failed to initialize: {e}[/red]")
+        raise typer.Exit(1)
+
     mode_label = "[green]LIVE[/green]" if live else "[yellow]MOCK[/yellow]"
     seed_label = f"[cyan]{seed}[/cyan]" if seed is not None else "[dim]random[/dim]"
     console.print(
@@ -84,78 +186,69 @@ def chat(
         )
     console.print()
 
-    try:
-        orchestrator = create_orchestrator(vault=vault, require_secrets=live)
-    except Exception as e:
-        console.print(f"[red]Failed to initialize: {e}[/red]")
-        raise typer.Exit(1)
-
-    # Single message mode
-    if single:
-        try:
-            response = orchestrator.chat(single)
-            console.print(Panel(Markdown(response), title="Assistant", border_style="green"))
-        except Exception as e:
-            console.print(f"[red]Error: {e}[/red]")
-            raise typer.Exit(1)
-        return
-
-    # Interactive mode
-    while True:
-        try:
-            user_input = Prompt.ask("\n[bold blue]You[/bold blue]")
-
-            if user_input.lower() in ("exit", "quit", "q"):
-                console.print("[dim]Goodbye![/dim]")
+    # Closing the orchestrator releases its pooled Ollama connections
+    with orchestrator:
+        # Single message mode
+        if single:
+            try:
+                _chat_turn(orchestrator, single)
+            except Exception as e:
+                console.print(f"[red]Error: {e}[/red]")
+                raise typer.Exit(1)
+            return
+
+        # Interactive mode
+        while True:
+            try:
+                user_input = Prompt.ask("\n[bold blue]You[/bold blue]")
+
+                if user_input.lower() in ("exit", "quit", "q"):
+                    console.print("[dim]Goodbye![/dim]")
+                    break
+
+                if user_input.lower() == "reset":
+                    orchestrator.reset()
+                    console.print("[dim]Conversation reset.[/dim]")
+                    continue
+
+                if not user_input.strip():
+                    continue
+
+                # Process the message (Ctrl-C cancels the request, not the session)
+                console.print()
+                try:
+                    _chat_turn(orchestrator, user_input)
+                except KeyboardInterrupt:
+                    console.print("\n[dim]Request cancelled.[/dim]")
+                    continue
+
+            except KeyboardInterrupt:
+                console.print("\n[dim]Interrupted. Goodbye![/dim]")
                 break
-
-            if user_input.lower() == "reset":
-                orchestrator.reset()
-                console.print("[dim]Conversation reset.[/dim]")
-                continue
-
-            if not user_input.strip():
-                continue
-
-            # Process the message
-            with console.status("[bold cyan]Thinking...[/bold cyan]"):
-                response = orchestrator.chat(user_input)
-
-            console.print()
-            console.print(Panel(Markdown(response), title="Assistant", border_style="green"))
-
-        except KeyboardInterrupt:
-            console.print("\n[dim]Interrupted. Goodbye![/dim]")
-            break
-        except Exception as e:
-            console.print(f"[red]Error: {e}[/red]")
-            console.print("[dim]Use 'reset' to start a new conversation.[/dim]")
+            except Exception as e:
+                console.print(f"[red]Error: {e}[/red]")
+                console.print("[dim]Use 'reset' to start a new conversation.[/dim]")
 
 
 @app.command()
 def test_connection():
     """Test connection to Ollama."""
-    import httpx
-
     console.print(f"Testing connection to Ollama at {config.ollama.base_url}...")
 
     try:
-        with httpx.Client(timeout=10) as client:
-            response = client.get(f"{config.ollama.base_url}/api/tags")
-            response.raise_for_status()
-            data = response.json()
+        response = _http_client().get(f"{config.ollama.base_url}/api/tags")
+        response.raise_for_status()
+        data = response.json()
 
-            models = [m["name"] for m in data.get("models", [])]
+        models = [m["name"] for m in data.get("models", [])]
 
-            console.print("[green]✓ Connected to Ollama[/green]")
-            console.print(f"Available models: {', '.join(models) or 'none'}")
+        console.print("[green]✓ Connected to Ollama[/green]")
+        console.print(f"Available models: {', '.join(models) or 'none'}")
 
-            if config.ollama.model not in models and f"{config.ollama.model}:latest" not in models:
-                console.print(
-                    f"[yellow]⚠ Configured model '{config.ollama.model}' not found[/yellow]"
-                )
-            else:
-                console.print(f"[green]✓ Model '{config.ollama.model}' available[/green]")
+        if config.ollama.model not in models and f"{config.ollama.model}:latest" not in models:
+            console.print(f"[yellow]⚠ Configured model '{config.ollama.model}' not found[/yellow]")
+        else:
+            console.print(f"[green]✓ Model '{config.ollama.model}' available[/green]")
 
     except Exception as e:
         console.print(f"[red]✗ Failed to connect: {e}[/red]")
@@ -165,6 +258,7 @@ def test_connection():
 @app.command()
 def test_onepassword(
     vault: str = typer.Option("SecureTools", "--vault", "-v", help="Vault name to test"),
+    verbose: bool = typer.Option(False, "--verbose", help="Also report the 1Password CLI version"),
 ):
     """Test connection to 1Password CLI."""
     import subprocess
@@ -172,20 +266,19 @@ def test_onepassword(
     console.print("Testing 1Password CLI...")
 
     try:
-        # Check if op is installed
-        result = subprocess.run(["op", "--version"], capture_output=True, text=True, timeout=10)
-
-        if result.returncode != 0:
-            console.print("[red]✗ 1Password CLI not working[/red]")
-            raise typer.Exit(1)
-
-        console.print(f"[green]✓ 1Password CLI version: {result.stdout.strip()}[/green]")
-
-        # Check if we can list vaults
+        # A single vault listing checks both that op is installed and that we're signed in
         result = subprocess.run(
             ["op", "vault", "list", "--format=json"], capture_output=True, text=True, timeout=30
         )
 
+        console.print("[green]✓ 1Password CLI installed[/green]")
+
+        if verbose:
+            version = subprocess.run(
+                ["op", "--version"], capture_output=True, text=True, timeout=10
+            )
+            console.print(f"[green]✓ 1Password CLI version: {version.stdout.strip()}[/green]")
+
         if result.returncode != 0:
             console.print("[yellow]⚠ Not signed in to 1Password[/yellow]")
             console.print("[dim]Run 'op signin' or set OP_SERVICE_ACCOUNT_TOKEN[/dim]")
@@ -253,10 +346,15 @@ def test_weather_api(
     This bypasses the LLM and directly tests the 1Password → API integration.
     Requires: op://SecureTools/WeatherAPI/api_key to be set in 1Password.
     """
-    import subprocess
-
     import httpx
 
+    from .secrets_broker import (
+        OnePasswordCLINotFoundError,
+        OnePasswordCLITimeoutError,
+        SecretReference,
+        SecretsBroker,
+    )
+
     console.print(
         Panel.fit(
             "[bold cyan]Testing Real Weather API[/bold cyan]\n"
@@ -266,37 +364,33 @@ def test_weather_api(
     )
     console.print()
 
-    # Step 1: Fetch API key from 1Password
+    # Step 1: Fetch API key from 1Password (through the broker, the only secret reader)
     console.print("[dim]Step 1: Fetching API key from 1Password...[/dim]")
-    secret_ref = f"op://{vault}/WeatherAPI/api_key"
+    secret_ref = SecretReference(vault=vault, item="WeatherAPI", field="api_key")
 
     try:
-        result = subprocess.run(
-            ["op", "read", secret_ref], capture_output=True, text=True, timeout=30
-        )
-
-        if result.returncode != 0:
-            console.print(f"[red]✗ Failed to read secret: {result.stderr.strip()}[/red]")
-            console.print()
-            console.print("[yellow]To fix this, create the secret in 1Password:[/yellow]")
-            cmd = 'op item create --category="API Credential" --title="WeatherAPI"'
-            cmd += f' --vault="{vault}" api_key="YOUR_KEY"'
-            console.print(f"[dim]{cmd}[/dim]")
-            console.print()
-            console.print("[dim]Get a free API key at: https://openweathermap.org/api[/dim]")
-            raise typer.Exit(1)
-
-        api_key = result.stdout.strip()
-        # Show only first/last 4 chars for verification
-        masked_key = f"{api_key[:4]}...{api_key[-4:]}" if len(api_key) > 8 else "****"
-        console.print(f"[green]✓ API key retrieved: {masked_key}[/green]")
-
-    except FileNotFoundError:
+        broker = SecretsBroker(require_secrets=True)
+        api_key = broker.read_secret(secret_ref)
+    except OnePasswordCLINotFoundError:
         console.print("[red]✗ 1Password CLI not installed[/red]")
         raise typer.Exit(1)
-    except subprocess.TimeoutExpired:
+    except OnePasswordCLITimeoutError:
         console.print("[red]✗ 1Password CLI timed out[/red]")
         raise typer.Exit(1)
+    except RuntimeError as e:
+        console.print(f"[red]✗ Failed to read secret: {e}[/red]")
+        console.print()
+        console.print("[yellow]To fix this, create the secret in 1Password:[/yellow]")
+        cmd = 'op item create --category="API Credential" --title="WeatherAPI"'
+        cmd += f' --vault="{vault}" api_key="YOUR_KEY"'
+        console.print(f"[dim]{cmd}[/dim]")
+        console.print()
+        console.print("[dim]Get a free API key at: https://openweathermap.org/api[/dim]")
+        raise typer.Exit(1)
+
+    # Show only first/last 4 chars for verification
+    masked_key = f"{api_key[:4]}...{api_key[-4:]}" if len(api_key) > 8 else "****"
+    console.print(f"[green]✓ API key retrieved: {masked_key}[/green]")
 
     # Step 2: Call OpenWeatherMap API
     console.print()
@@ -306,10 +400,9 @@ def test_weather_api(
         url = "https://api.openweathermap.org/data/2.5/weather"
         params = {"q": location, "appid": api_key, "units": "metric"}
 
-        with httpx.Client(timeout=10) as client:
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = _http_client().get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
 
         console.print("[green]✓ API call successful![/green]")
         console.print()
@@ -362,6 +455,8 @@ def test_weather_api(
 @app.command()
 def help():
     """Show a comprehensive guide on how to use Secure Tools."""
+    from rich.markdown import Markdown
+
     help_text = """
 # Secure Tools - Quick Reference
 
@@ -406,6 +501,7 @@ python run.py chat --live          # Require real secrets
 python run.py chat --model qwen2   # Use different model
 python run.py chat --single "..."  # Single message mode
 python run.py chat --seed 42       # Reproducible outputs (same seed = same response for same input)
+python run.py chat --seed 42 --cache  # Reuse responses to repeated opening messages
 ```
 
 ## Setting Up 1Password
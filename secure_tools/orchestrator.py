@@ -11,19 +11,46 @@ Responsibilities:
 IMPORTANT: This component NEVER handles secrets directly.
 """
 
+import asyncio
+import contextlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+import fastjsonschema
 import httpx
-from pydantic import BaseModel
+import orjson
 from rich.console import Console
 
 from .config import config
 from .secrets_broker import SecretsBroker
-from .tools import ToolCall, ToolResult, tool_registry
+from .tools import ToolCall, ToolResult, registry_version, tool_registry
 
 console = Console()
 
 # Maximum characters to include in error messages from API responses
 ERROR_RESPONSE_TRUNCATE_LENGTH = 200
 
+# Timeout for the background request that loads the model into memory
+WARMUP_TIMEOUT_SECONDS = 30.0
+
+# Headers for requests whose body is pre-serialized JSON
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Receives assistant content fragments as they stream in from Ollama
+ContentCallback = Callable[[str], None]
+
+# Receives the tool calls from each streamed chunk that carries any
+ToolCallsCallback = Callable[[list[dict]], None]
+
+# Maximum number of final responses kept in the prompt -> response cache
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+# Connection pool for the Ollama client (connections are kept alive across turns)
+OLLAMA_CONNECTION_LIMITS = httpx.Limits(
+    max_keepalive_connections=20, max_connections=40, keepalive_expiry=30.0
+)
+
 
 class OllamaError(Exception):
     """Base exception for Ollama-related errors."""
@@ -43,15 +70,6 @@ class OllamaResponseError(OllamaError):
     pass
 
 
-class Message(BaseModel):
-    """A conversation message."""
-
-    role: str  # "user", "assistant", or "tool"
-    content: str
-    tool_calls: list[dict] | None = None
-    tool_call_id: str | None = None
-
-
 class Orchestrator:
     """
     Orchestrates communication between user, LLM, and tools.
@@ -80,52 +98,178 @@ You have access to tools that can fetch real-time data. Use them when appropriat
 
     def __init__(self, secrets_broker: SecretsBroker):
         self.secrets_broker = secrets_broker
-        self.client = httpx.Client(base_url=config.ollama.base_url, timeout=config.ollama.timeout)
-        self.conversation: list[Message] = []
+        # One client (and connection pool) for the lifetime of the orchestrator
+        self.client = httpx.AsyncClient(
+            base_url=config.ollama.base_url,
+            timeout=config.ollama.timeout,
+            limits=OLLAMA_CONNECTION_LIMITS,
+        )
+        # Event loop used by the synchronous chat() wrapper, reused across turns
+        # so that pooled connections stay bound to a live loop
+        self._runner: asyncio.Runner | None = None
+        # Conversation history, kept in Ollama's wire format so it can be sent as-is
+        self.conversation: list[dict] = []
         self.tool_call_count = 0
+        # The system prompt never changes, so its message is built once
+        self._system_message = {"role": "system", "content": self.SYSTEM_PROMPT}
+        # Snapshot of the tool nicelist (None = all registered tools allowed)
+        self._allowed: frozenset[str] | None = frozenset(config.security.allowed_tools) or None
+        # Tool definitions for the registered tools that pass the nicelist, plus their
+        # JSON (None when there are no tools), rebuilt whenever the registry changes
+        self._tool_defs_key: tuple[int, frozenset[str] | None] | None = None
+        self._tool_defs_payload: list[dict] = []
+        self._tool_defs_json: orjson.Fragment | None = None
+        # Final responses for opening prompts, keyed on everything that determines them
+        self._response_cache: OrderedDict[tuple, str] = OrderedDict()
+
+    def __enter__(self) -> "Orchestrator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "Orchestrator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the Ollama client and release pooled connections."""
+        await self.client.aclose()
+
+    def close(self) -> None:
+        """Close the Ollama client and the event loop used by chat()."""
+        if self._runner is None:
+            asyncio.run(self.aclose())
+            return
+        self._runner.run(self.aclose())
+        self._runner.close()
+        self._runner = None
+
+    def start_warmup(self) -> threading.Thread:
+        """
+        Load the model into Ollama's memory in the background.
+
+        The first request to a cold model pays its full load time. Sending an
+        empty generate request up front lets that overlap with the user
+        typing, and keep_alive keeps the model resident between turns.
+        Errors are ignored; the first chat request will report them.
+        """
+
+        def warmup() -> None:
+            with contextlib.suppress(httpx.HTTPError):
+                httpx.post(
+                    f"{config.ollama.base_url}/api/generate",
+                    json={"model": config.ollama.model, "keep_alive": config.ollama.keep_alive},
+                    timeout=WARMUP_TIMEOUT_SECONDS,
+                )
+
+        thread = threading.Thread(target=warmup, name="ollama-warmup", daemon=True)
+        thread.start()
+        return thread
 
     def get_tool_definitions(self) -> list[dict]:
-        """Get tool definitions for Ollama in the expected format."""
-        tools = []
-        for name, tool in tool_registry.items():
-            # Respect nicelist if configured
-            if config.security.allowed_tools and name not in config.security.allowed_tools:
-                continue
+        """
+        Get tool definitions for Ollama in the expected format.
 
-            tools.append(
-                {
-                    "type": "function",
-                    "function": {
-                        "name": name,
-                        "description": tool.description,
-                        "parameters": tool.parameters,
-                    },
-                }
-            )
-        return tools
-
-    def _call_ollama(self, messages: list[dict], include_tools: bool = True) -> dict:
+        The list is cached and shared between calls; don't modify it.
+        """
+        self._sync_tool_definitions()
+        return self._tool_defs_payload
+
+    def _sync_tool_definitions(self) -> None:
+        """Rebuild the cached tool definitions if the registry changed since they were built."""
+        key = (registry_version(), self._allowed)
+        if key == self._tool_defs_key:
+            return
+        if self._tool_defs_key is not None:
+            # Cached responses were produced with the old tool set
+            self._response_cache.clear()
+        self._tool_defs_key = key
+        self._tool_defs_payload = [
+            {
+                "type": "function",
+                "function": {
+                    "name": name,
+                    "description": tool.description,
+                    "parameters": tool.parameters,
+                },
+            }
+            for name, tool in tool_registry.items()
+            if self._allowed is None or name in self._allowed
+        ]
+        # Serialized once here, then spliced into each request body as-is
+        self._tool_defs_json = (
+            orjson.Fragment(orjson.dumps(self._tool_defs_payload))
+            if self._tool_defs_payload
+            else None
+        )
+
+    def invalidate_tool_cache(self) -> None:
+        """Pick up nicelist changes (registry changes are detected automatically)."""
+        self._allowed = frozenset(config.security.allowed_tools) or None
+        self._sync_tool_definitions()
+
+    def _response_cache_key(self, user_message: str) -> tuple | None:
         """
-        Make a request to Ollama's chat API.
+        Build the response cache key for a message, or None if it can't be cached.
+
+        Only opening prompts with a fixed seed are cacheable: the model output
+        is then deterministic and doesn't depend on earlier turns.
+        """
+        if not config.ollama.cache_enabled or config.ollama.seed is None or self.conversation:
+            return None
+        return (config.ollama.model, config.ollama.seed, hash(self.SYSTEM_PROMPT), user_message)
+
+    async def _call_ollama(
+        self,
+        messages: list[dict],
+        include_tools: bool = True,
+        on_content: ContentCallback | None = None,
+        on_tool_calls: ToolCallsCallback | None = None,
+    ) -> dict:
+        """
+        Make a streaming request to Ollama's chat API.
+
+        Content fragments are passed to on_content, and each chunk's tool
+        calls to on_tool_calls, as they arrive. The stream is read to the
+        end, since parallel tool calls may arrive in separate chunks; all of
+        them are collected into the returned message.
+
+        Returns:
+            A response dict with the assembled assistant "message"
 
         Raises:
             OllamaConnectionError: If connection to Ollama fails
             OllamaResponseError: If Ollama returns an invalid response
         """
-        payload = {"model": config.ollama.model, "messages": messages, "stream": False}
+        payload = {
+            "model": config.ollama.model,
+            "messages": messages,
+            "stream": True,
+            "keep_alive": config.ollama.keep_alive,
+        }
 
         # Add options for reproducible outputs if seed is configured
         if config.ollama.seed is not None:
             payload["options"] = {"seed": config.ollama.seed}
 
         if include_tools:
-            tools = self.get_tool_definitions()
-            if tools:
-                payload["tools"] = tools
+            self._sync_tool_definitions()
+            if self._tool_defs_json is not None:
+                payload["tools"] = self._tool_defs_json
 
         try:
-            response = self.client.post("/api/chat", json=payload)
-            response.raise_for_status()
+            # Serialize with orjson; the tools and history can make this payload large
+            async with self.client.stream(
+                "POST", "/api/chat", content=orjson.dumps(payload), headers=JSON_HEADERS
+            ) as response:
+                if response.is_error:
+                    # Load the body so the error message can include it
+                    await response.aread()
+                    response.raise_for_status()
+                message = await self._read_stream(response, on_content, on_tool_calls)
         except httpx.ConnectError as e:
             raise OllamaConnectionError(
                 f"Failed to connect to Ollama at {config.ollama.base_url}. "
@@ -144,20 +288,67 @@ You have access to tools that can fetch real-time data. Use them when appropriat
         except httpx.HTTPError as e:
             raise OllamaConnectionError(f"HTTP error communicating with Ollama: {e}") from e
 
-        # Parse and validate response
-        try:
-            data: dict = response.json()
-        except ValueError as e:
-            truncated_response = response.text[:ERROR_RESPONSE_TRUNCATE_LENGTH]
-            raise OllamaResponseError(f"Ollama returned invalid JSON: {truncated_response}") from e
+        return {"message": message}
+
+    async def _read_stream(
+        self,
+        response: httpx.Response,
+        on_content: ContentCallback | None,
+        on_tool_calls: ToolCallsCallback | None,
+    ) -> dict:
+        """
+        Assemble the assistant message from Ollama's JSON-lines stream.
+
+        Raises:
+            OllamaResponseError: If a chunk is invalid or reports an error
+        """
+        content_parts: list[str] = []
+        tool_calls: list[dict] = []
+
+        async for line in response.aiter_lines():
+            if not line.strip():
+                continue
+
+            # Parse and validate each chunk
+            try:
+                chunk: dict = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                truncated_line = line[:ERROR_RESPONSE_TRUNCATE_LENGTH]
+                raise OllamaResponseError(f"Ollama returned invalid JSON: {truncated_line}") from e
+
+            if "error" in chunk:
+                raise OllamaResponseError(f"Ollama returned an error: {chunk['error']}")
+
+            # Validate expected chunk structure
+            if "message" not in chunk:
+                keys = list(chunk.keys())
+                console.print(
+                    f"[dim yellow]Warning: Unexpected Ollama response: {keys}[/dim yellow]"
+                )
+                raise OllamaResponseError(
+                    f"Ollama response missing 'message' field. Got keys: {keys}"
+                )
+
+            fragment = chunk["message"].get("content", "")
+            if fragment:
+                content_parts.append(fragment)
+                if on_content is not None:
+                    on_content(fragment)
+
+            # Parallel tool calls can be spread over several chunks, so collect them all
+            chunk_tool_calls = chunk["message"].get("tool_calls")
+            if chunk_tool_calls:
+                tool_calls.extend(chunk_tool_calls)
+                if on_tool_calls is not None:
+                    on_tool_calls(chunk_tool_calls)
 
-        # Validate expected response structure
-        if "message" not in data:
-            keys = list(data.keys())
-            console.print(f"[dim yellow]Warning: Unexpected Ollama response: {keys}[/dim yellow]")
-            raise OllamaResponseError(f"Ollama response missing 'message' field. Got keys: {keys}")
+            if chunk.get("done"):
+                break
 
-        return data
+        message: dict = {"role": "assistant", "content": "".join(content_parts)}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return message
 
     def _validate_tool_call(self, tool_call: dict) -> ToolCall:
         """
@@ -175,17 +366,22 @@ You have access to tools that can fetch real-time data. Use them when appropriat
         if name not in tool_registry:
             raise ValueError(f"Unknown tool requested: {name}")
 
-        if config.security.allowed_tools and name not in config.security.allowed_tools:
+        if self._allowed is not None and name not in self._allowed:
             raise ValueError(f"Tool not allowed: {name}")
 
         tool = tool_registry[name]
 
         # Validate required parameters
-        required = tool.parameters.get("required", [])
-        for param in required:
+        for param in tool.required:
             if param not in arguments:
                 raise ValueError(f"Missing required parameter '{param}' for tool '{name}'")
 
+        # Validate argument types and values against the tool's schema
+        try:
+            tool.validator(arguments)
+        except fastjsonschema.JsonSchemaValueException as e:
+            raise ValueError(f"Invalid arguments for tool '{name}': {e.message}")
+
         return ToolCall(id=call_id, name=name, arguments=arguments)
 
     def _execute_tool(self, tool_call: ToolCall) -> ToolResult:
@@ -208,7 +404,82 @@ You have access to tools that can fetch real-time data. Use them when appropriat
 
         return result
 
-    def chat(self, user_message: str) -> str:
+    async def _execute_tool_async(self, tool_call: ToolCall) -> ToolResult:
+        """
+        Execute a tool without blocking the event loop.
+
+        The broker is synchronous, so the call runs in a worker thread. A
+        failing call yields an error result rather than raising, so it can't
+        cancel the calls running alongside it.
+        """
+        try:
+            return await asyncio.to_thread(self._execute_tool, tool_call)
+        except Exception as e:
+            return ToolResult(success=False, content=f"Error executing tool: {e}")
+
+    async def _call_ollama_and_tools(
+        self, messages: list[dict], on_content: ContentCallback | None
+    ) -> tuple[dict, list[str]]:
+        """
+        Stream one response from Ollama, running its tool calls as they arrive.
+
+        Each chunk's tool calls are validated and started straight away, so
+        they run while the rest of the response is still streaming. Rejected
+        calls get an error result without running.
+
+        Returns:
+            The assistant message, and one result content per tool call in
+            the order the calls were made
+        """
+        outcomes: list[asyncio.Task[ToolResult] | str] = []
+
+        try:
+            async with asyncio.TaskGroup() as group:
+
+                def dispatch(tool_calls: list[dict]) -> None:
+                    # Check tool call limit
+                    self.tool_call_count += len(tool_calls)
+                    if self.tool_call_count > config.security.max_tool_calls:
+                        raise RuntimeError(
+                            f"Tool call limit exceeded ({config.security.max_tool_calls}). "
+                            "This may indicate a runaway agent."
+                        )
+
+                    for raw_tool_call in tool_calls:
+                        try:
+                            tool_call = self._validate_tool_call(raw_tool_call)
+                        except Exception as e:
+                            outcomes.append(f"Error executing tool: {str(e)}")
+                        else:
+                            outcomes.append(group.create_task(self._execute_tool_async(tool_call)))
+
+                response = await self._call_ollama(
+                    messages, on_content=on_content, on_tool_calls=dispatch
+                )
+        except ExceptionGroup as e:
+            # Tool calls report failures as results, so this is the stream's own
+            # error; the group has already cancelled the calls it started
+            error = e.exceptions[0]
+            raise error from error.__cause__
+
+        contents = [
+            outcome if isinstance(outcome, str) else outcome.result().content
+            for outcome in outcomes
+        ]
+        return response.get("message", {}), contents
+
+    def chat(self, user_message: str, on_content: ContentCallback | None = None) -> str:
+        """
+        Process a user message through the full conversation loop.
+
+        Synchronous wrapper around chat_async() for the CLI. All calls share
+        one event loop so the Ollama connection pool is reused across turns.
+        """
+        if self._runner is None:
+            self._runner = asyncio.Runner()
+        return self._runner.run(self.chat_async(user_message, on_content))
+
+    async def chat_async(self, user_message: str, on_content: ContentCallback | None = None) -> str:
         """
         Process a user message through the full conversation loop.
 
@@ -217,77 +488,105 @@ You have access to tools that can fetch real-time data. Use them when appropriat
         2. If LLM requests tools, execute them
         3. Return tool results to LLM
         4. Repeat until LLM provides final response
+
+        If on_content is given, it receives the assistant's content
+        fragments as they stream in.
+
+        If the turn is interrupted (Ctrl-C), the partial turn is dropped
+        from the conversation. Tool calls already running in worker threads
+        finish in the background; their results are discarded.
         """
+        # Drops cached responses if the tool registry changed since they were made
+        self._sync_tool_definitions()
+        cache_key = self._response_cache_key(user_message)
+        if cache_key is not None and cache_key in self._response_cache:
+            self._response_cache.move_to_end(cache_key)
+            cached_response = self._response_cache[cache_key]
+            self.conversation.append({"role": "user", "content": user_message})
+            self.conversation.append({"role": "assistant", "content": cached_response})
+            return cached_response
+
+        turn_start = len(self.conversation)
+        try:
+            response = await self._run_turn(user_message, on_content)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            del self.conversation[turn_start:]
+            raise
+
+        if cache_key is not None:
+            self._response_cache[cache_key] = response
+            if len(self._response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+                self._response_cache.popitem(last=False)
+        return response
+
+    async def _run_turn(self, user_message: str, on_content: ContentCallback | None) -> str:
+        """Run the conversation loop for a single user message."""
         # Add user message to conversation
-        self.conversation.append(Message(role="user", content=user_message))
+        self.conversation.append({"role": "user", "content": user_message})
 
         while True:
-            # Convert conversation to Ollama format, starting with system prompt
-            messages: list[dict] = [{"role": "system", "content": self.SYSTEM_PROMPT}]
-            for msg in self.conversation:
-                message_dict: dict = {"role": msg.role, "content": msg.content}
-                if msg.tool_calls:
-                    message_dict["tool_calls"] = msg.tool_calls
-                if msg.tool_call_id:
-                    message_dict["tool_call_id"] = msg.tool_call_id
-                messages.append(message_dict)
+            # Conversation is already in Ollama format; prepend the system prompt
+            messages = [self._system_message, *self.conversation]
 
-            # Call Ollama (errors bubble up with clear messages)
-            response = self._call_ollama(messages)
-
-            assistant_msg = response.get("message", {})
+            # Call Ollama, running requested tools while it streams (errors
+            # bubble up with clear messages)
+            assistant_msg, contents = await self._call_ollama_and_tools(messages, on_content)
 
             # Check for tool calls
             tool_calls = assistant_msg.get("tool_calls", [])
 
             if tool_calls:
-                # Check tool call limit
-                self.tool_call_count += len(tool_calls)
-                if self.tool_call_count > config.security.max_tool_calls:
-                    raise RuntimeError(
-                        f"Tool call limit exceeded ({config.security.max_tool_calls}). "
-                        "This may indicate a runaway agent."
-                    )
-
                 # Add assistant's tool call message
                 self.conversation.append(
-                    Message(
-                        role="assistant",
-                        content=assistant_msg.get("content", ""),
-                        tool_calls=tool_calls,
-                    )
+                    {
+                        "role": "assistant",
+                        "content": assistant_msg.get("content", ""),
+                        "tool_calls": tool_calls,
+                    }
                 )
 
-                # Execute each tool call
-                for raw_tool_call in tool_calls:
-                    try:
-                        validated_call = self._validate_tool_call(raw_tool_call)
-                        result = self._execute_tool(validated_call)
-
-                        # Add tool result to conversation
-                        self.conversation.append(
-                            Message(
-                                role="tool", content=result.content, tool_call_id=validated_call.id
-                            )
-                        )
-                    except Exception as e:
-                        # On error, still add a result so LLM can handle gracefully
-                        self.conversation.append(
-                            Message(
-                                role="tool",
-                                content=f"Error executing tool: {str(e)}",
-                                tool_call_id=raw_tool_call.get("id", "unknown"),
-                            )
-                        )
+                # Add tool results to conversation in the original order
+                for raw_tool_call, content in zip(tool_calls, contents, strict=True):
+                    self.conversation.append(
+                        {
+                            "role": "tool",
+                            "content": content,
+                            "tool_call_id": raw_tool_call.get("id", "unknown"),
+                        }
+                    )
 
                 # Continue the loop to get LLM's next response
                 continue
 
             # No tool calls - this is the final response
             final_content: str = assistant_msg.get("content", "")
-            self.conversation.append(Message(role="assistant", content=final_content))
+            self.conversation.append({"role": "assistant", "content": final_content})
+            self._trim_history()
             return final_content
 
+    def _trim_history(self) -> None:
+        """
+        Drop old messages so the history sent to Ollama stays bounded.
+
+        Ollama re-evaluates the whole history on every request, so an
+        unbounded conversation makes every turn slower. The first user
+        message is kept for context, and a tool result is never kept
+        without the assistant message that requested it.
+        """
+        window = config.ollama.history_window
+        if not window:
+            return
+        # The first message plus at least the latest one
+        window = max(window, 2)
+        if len(self.conversation) <= window:
+            return
+
+        # Keep the first message plus the most recent (window - 1) messages
+        start = len(self.conversation) - (window - 1)
+        while start < len(self.conversation) and self.conversation[start]["role"] == "tool":
+            start += 1
+        self.conversation = [self.conversation[0], *self.conversation[start:]]
+
     def reset(self):
         """Reset conversation state."""
         self.conversation = []
@@ -10,10 +10,20 @@ All secrets stay within this boundary. Results are sanitized
 before being returned to the orchestrator.
 """
 
+import os
+import re
+import shutil
 import subprocess
-from collections.abc import Callable
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+from secrets import token_hex
+from typing import overload
 
-from pydantic import BaseModel
 from rich.console import Console
 
 from .config import config
@@ -21,30 +31,108 @@ from .tools import ToolCall, ToolResult
 
 console = Console()
 
+OP_NOT_FOUND_MESSAGE = "1Password CLI (op) not found. Install it with: brew install 1password-cli"
+
 # Timeout for 1Password CLI operations
 OP_CLI_TIMEOUT_SECONDS = 30
 
+# Delay before a background cache warmup starts, so that registering several
+# tools in a row triggers a single warmup
+WARM_CACHE_DEBOUNCE_SECONDS = 0.05
+
+# Maximum number of secrets kept in a broker's cache
+SECRET_CACHE_MAX_ENTRIES = 256
+
+# Maximum number of compiled scrub patterns kept (one per distinct set of secrets)
+SCRUB_PATTERN_CACHE_MAX_ENTRIES = 32
+
+
+class OnePasswordCLINotFoundError(RuntimeError):
+    """Raised when the 1Password CLI (op) is not installed."""
+
+
+class OnePasswordCLITimeoutError(RuntimeError):
+    """Raised when a 1Password CLI (op) command doesn't finish in time."""
+
 
-class SecretReference(BaseModel):
+@dataclass(frozen=True, slots=True)
+class SecretReference:
     """
     A reference to a secret in 1Password.
 
     Format: op://<vault>/<item>/<field>
     Example: op://SecureTools/WeatherAPI/api_key
+
+    A plain dataclass: references are built from config that was already
+    validated (see tools/loader.py), so they skip Pydantic validation.
     """
 
     vault: str
     item: str
     field: str = "password"
+    # The op:// reference, computed once (it's the cache key on every lookup)
+    uri: str = dataclass_field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "uri", f"op://{self.vault}/{self.item}/{self.field}")
+
+
+class SecretCache:
+    """
+    In-memory secret cache with a time-to-live and a size bound.
+
+    Entries expire after `ttl` seconds so rotated secrets are picked up, and
+    the least recently used entry is evicted once `maxsize` is reached.
+    Thread-safe: secrets are fetched from worker threads.
+    """
 
-    @property
-    def uri(self) -> str:
-        return f"op://{self.vault}/{self.item}/{self.field}"
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Map of secret URIs to (expiry time, value), least recently used first
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @overload
+    def get(self, key: str) -> str | None: ...
+
+    @overload
+    def get(self, key: str, default: str) -> str: ...
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        """Return a cached secret, or default if it's missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
 
 
 # Type alias for tool execution functions
 ToolExecutor = Callable[[dict, dict], ToolResult]
 
+# Creates the (not yet started) timer for a debounced warmup: (delay, callback) -> timer
+TimerFactory = Callable[[float, Callable[[], object]], threading.Timer]
+
 
 class SecretsBroker:
     """
@@ -59,21 +147,54 @@ class SecretsBroker:
     SECURITY: Secrets never leave this component.
     """
 
-    def __init__(self, require_secrets: bool = False):
+    def __init__(
+        self,
+        require_secrets: bool = False,
+        warm_on_register: bool = False,
+        timer_factory: TimerFactory = threading.Timer,
+    ):
         """
         Initialize the secrets broker.
 
         Args:
             require_secrets: If True, fail when secrets can't be fetched.
                            If False, allow tools to run in mock mode.
+            warm_on_register: If True, fetch the secrets of newly registered
+                           tools in the background (see warm_cache).
+            timer_factory: Creates the timer that debounces those warmups
+                           (replaceable so tests can fire it deterministically).
+
+        Raises:
+            RuntimeError: If require_secrets is set and the 1Password CLI isn't installed
         """
         self.require_secrets = require_secrets
+        # Absolute path of the 1Password CLI, resolved once (None if not installed)
+        self._op_bin = shutil.which("op")
+        if require_secrets and self._op_bin is None:
+            raise OnePasswordCLINotFoundError(OP_NOT_FOUND_MESSAGE)
+        # Environment for op processes (None = inherit ours unchanged)
+        self._op_env = self._build_op_env()
         # Map of tool names to their executors
         self._executors: dict[str, ToolExecutor] = {}
         # Map of tool names to their required secrets
         self._secret_refs: dict[str, list[SecretReference]] = {}
         # Cache of resolved secrets (in memory only, never logged)
-        self._secret_cache: dict[str, str] = {}
+        self._secret_cache = SecretCache(
+            maxsize=SECRET_CACHE_MAX_ENTRIES, ttl=config.onepassword.cache_ttl_seconds
+        )
+        # Compiled scrub patterns, keyed on the secret values they redact, so tools
+        # with different secrets sharing this broker don't recompile on every call
+        # (guarded by _scrub_patterns_lock: tools run in concurrent threads)
+        self._scrub_patterns: OrderedDict[tuple[str, ...], re.Pattern[str]] = OrderedDict()
+        self._scrub_patterns_lock = threading.Lock()
+        self.warm_on_register = warm_on_register
+        # Secrets currently being fetched, so concurrent requests for the same
+        # reference share one `op read` (guarded by _inflight_lock)
+        self._inflight: dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+        # Pending background warmup (restarted by each registration)
+        self._timer_factory = timer_factory
+        self._warm_timer: threading.Timer | None = None
 
     def register_tool(
         self,
@@ -92,6 +213,32 @@ class SecretsBroker:
         self._executors[name] = executor
         if secrets:
             self._secret_refs[name] = secrets
+            if self.warm_on_register:
+                self._schedule_warm_cache()
+
+    def register_tools(
+        self, tools: Iterable[tuple[str, ToolExecutor, list[SecretReference] | None]]
+    ) -> None:
+        """
+        Register several tools at once.
+
+        Args:
+            tools: (name, executor, secrets) entries, as for register_tool
+        """
+        batch = list(tools)
+        self._executors.update((name, executor) for name, executor, _ in batch)
+        self._secret_refs.update((name, secrets) for name, _, secrets in batch if secrets)
+        if self.warm_on_register and any(secrets for _, _, secrets in batch):
+            self._schedule_warm_cache()
+
+    def _schedule_warm_cache(self) -> threading.Timer:
+        """Start (or restart) the debounced background warmup."""
+        if self._warm_timer is not None:
+            self._warm_timer.cancel()
+        self._warm_timer = self._timer_factory(WARM_CACHE_DEBOUNCE_SECONDS, self.warm_cache)
+        self._warm_timer.daemon = True
+        self._warm_timer.start()
+        return self._warm_timer
 
     def _get_secret(self, ref: SecretReference) -> str:
         """
@@ -105,47 +252,195 @@ class SecretsBroker:
         cache_key = ref.uri
 
         # Check cache first
-        if cache_key in self._secret_cache:
-            return self._secret_cache[cache_key]
+        cached = self._secret_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Single-flight: if another thread is already fetching this secret, wait for it
+        with self._inflight_lock:
+            event = self._inflight.get(cache_key)
+            if event is None:
+                self._inflight[cache_key] = threading.Event()
+
+        if event is not None:
+            event.wait(timeout=OP_CLI_TIMEOUT_SECONDS)
+            cached = self._secret_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            # The other fetch failed; fetch it ourselves so the error is reported
+            return self._read_secret(ref)
+
+        try:
+            return self._read_secret(ref)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key).set()
+
+    def read_secret(self, ref: SecretReference) -> str:
+        """
+        Retrieve a single secret (cached like any other).
+
+        For diagnostics such as `test-weather-api`; tools get their secrets
+        through execute_tool.
+
+        Raises:
+            OnePasswordCLINotFoundError: If the 1Password CLI isn't installed
+            OnePasswordCLITimeoutError: If the 1Password CLI doesn't respond in time
+            RuntimeError: If the secret can't be read
+        """
+        return self._get_secret(ref)
+
+    def _read_secret(self, ref: SecretReference) -> str:
+        """Read a secret with `op read` and cache it."""
+        cache_key = ref.uri
+        result = self._run_op(["read", ref.uri])
+
+        if result.returncode != 0:
+            # Callers report the failure (tool execution prints its own status line)
+            raise RuntimeError(f"1Password CLI error: {result.stderr.strip()}")
+
+        secret = result.stdout.strip()
+
+        # Cache it
+        self._secret_cache[cache_key] = secret
+
+        return secret
+
+    def _get_secrets_bulk(self, refs: list[SecretReference]) -> int:
+        """
+        Retrieve several secrets from 1Password with a single `op inject` call.
+
+        Each `op` invocation pays for process startup and authentication, so
+        resolving N references in one call is much cheaper than N `op read`s.
+        The references are injected into a template, separated by a random
+        boundary, and the output is split back into the cache.
 
-        # Build op command
-        cmd = ["op", "read", ref.uri]
+        `op inject` fails as a whole if any reference can't be resolved, so
+        callers fall back to _get_secret to find out which one is missing.
 
-        # Set up environment
-        env = None
-        if config.onepassword.service_account_token:
-            import os
+        Secrets another thread is already fetching are skipped (single-flight,
+        as in _get_secret); callers pick them up through _get_secret, which
+        waits for that fetch.
 
-            env = os.environ.copy()
-            env["OP_SERVICE_ACCOUNT_TOKEN"] = config.onepassword.service_account_token
+        SECURITY: Like _get_secret, results only ever go into the cache.
+
+        Returns:
+            Number of secrets that were fetched by this call
+        """
+        with self._inflight_lock:
+            claimed = [
+                ref
+                for uri, ref in {ref.uri: ref for ref in refs}.items()
+                if uri not in self._inflight
+            ]
+            for ref in claimed:
+                self._inflight[ref.uri] = threading.Event()
+        if not claimed:
+            return 0
+
+        try:
+            boundary = f"--{token_hex(16)}--"
+            template = f"\n{boundary}\n".join(f"{{{{ {ref.uri} }}}}" for ref in claimed)
+
+            result = self._run_op(["inject"], input=template)
+
+            if result.returncode != 0:
+                raise RuntimeError(f"1Password CLI error: {result.stderr.strip()}")
+
+            values = result.stdout.split(f"\n{boundary}\n")
+            if len(values) != len(claimed):
+                raise RuntimeError("1Password CLI returned unexpected inject output")
+
+            for ref, value in zip(claimed, values, strict=True):
+                self._secret_cache[ref.uri] = value.strip()
+            return len(claimed)
+        finally:
+            with self._inflight_lock:
+                for ref in claimed:
+                    self._inflight.pop(ref.uri).set()
+
+    def _run_op(
+        self, args: list[str], input: str | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        """Run a 1Password CLI command, translating launch failures into RuntimeError."""
+        if self._op_bin is None:
+            raise OnePasswordCLINotFoundError(OP_NOT_FOUND_MESSAGE)
 
         try:
-            result = subprocess.run(
-                cmd,
+            return subprocess.run(
+                [self._op_bin, *args],
+                input=input,
                 capture_output=True,
                 text=True,
-                env=env,
+                env=self._op_env,
                 timeout=OP_CLI_TIMEOUT_SECONDS,
             )
+        except subprocess.TimeoutExpired:
+            raise OnePasswordCLITimeoutError("1Password CLI timed out")
+        except FileNotFoundError:
+            raise OnePasswordCLINotFoundError(OP_NOT_FOUND_MESSAGE)
+
+    @staticmethod
+    def _build_op_env() -> dict[str, str] | None:
+        """Build the op environment, adding the service account token if configured."""
+        token = config.onepassword.service_account_token
+        if not token:
+            return None
+        return {**os.environ, "OP_SERVICE_ACCOUNT_TOKEN": token}
+
+    def refresh_env(self) -> None:
+        """Rebuild the op environment after os.environ or the service account token changes."""
+        self._op_env = self._build_op_env()
+
+    def _get_secret_outcome(self, ref: SecretReference) -> str | Exception:
+        """Fetch a secret, returning the error instead of raising it."""
+        try:
+            return self._get_secret(ref)
+        except Exception as e:
+            return e
 
-            if result.returncode != 0:
-                error_msg = result.stderr.strip()
-                # Never log the command output in detail (might contain hints)
-                console.print("[red]Failed to retrieve secret from 1Password[/red]")
-                raise RuntimeError(f"1Password CLI error: {error_msg}")
+    def warm_cache(self) -> int:
+        """
+        Fetch every secret needed by the registered tools into the cache.
 
-            secret = result.stdout.strip()
+        All secrets are first requested with a single `op inject`; if that
+        fails, they are read individually and concurrently (each `op read`
+        is dominated by CLI startup). Failures are not raised here; they are
+        reported (with the usual mock/live handling) when the tool is executed.
 
-            # Cache it
-            self._secret_cache[cache_key] = secret
+        Returns:
+            Number of secrets that were fetched
+        """
+        # Snapshot the values: this may run in a background thread while tools register
+        refs = {ref.uri: ref for refs in list(self._secret_refs.values()) for ref in refs}
+        pending = [ref for uri, ref in refs.items() if uri not in self._secret_cache]
+        if not pending:
+            return 0
 
-            return secret
+        try:
+            return self._get_secrets_bulk(pending)
+        except RuntimeError:
+            outcomes = self._get_secrets_concurrently(pending)
+            return sum(not isinstance(outcome, Exception) for outcome in outcomes.values())
 
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("1Password CLI timed out")
-        except FileNotFoundError:
-            raise RuntimeError(
-                "1Password CLI (op) not found. Install it with: brew install 1password-cli"
+    def _get_secrets_concurrently(self, refs: list[SecretReference]) -> dict[str, str | Exception]:
+        """
+        Fetch secrets into the cache with individual `op read`s run in parallel.
+
+        Each read is dominated by CLI startup and the 1Password round-trip, so
+        running them concurrently takes about as long as the slowest one.
+
+        Returns:
+            The secret, or the error that prevented reading it, for each reference URI
+        """
+        max_workers = min(config.onepassword.max_concurrent_reads, len(refs))
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as pool:
+            return dict(
+                zip(
+                    (ref.uri for ref in refs),
+                    pool.map(self._get_secret_outcome, refs),
+                    strict=True,
+                )
             )
 
     def _resolve_secrets(self, tool_name: str) -> dict[str, str]:
@@ -161,10 +456,27 @@ class SecretsBroker:
         secrets = {}
         refs = self._secret_refs.get(tool_name, [])
 
+        # Fetch everything that isn't cached yet in one CLI call, falling back to
+        # concurrent individual reads. The loop below reports each read's outcome
+        # with the usual mock/live handling, without reading a failed secret again.
+        outcomes: dict[str, str | Exception] = {}
+        pending = [ref for ref in refs if ref.uri not in self._secret_cache]
+        if len(pending) > 1:
+            try:
+                self._get_secrets_bulk(pending)
+            except RuntimeError:
+                outcomes = self._get_secrets_concurrently(pending)
+
+        # Rendering with Rich isn't free, so success lines are part of the audit log
+        announce = config.security.audit_logging
         for ref in refs:
             try:
-                secrets[ref.field] = self._get_secret(ref)
-                console.print(f"[green]🔑 Secret loaded: {ref.item}/{ref.field}[/green]")
+                outcome = outcomes.get(ref.uri)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                secrets[ref.field] = outcome if outcome is not None else self._get_secret(ref)
+                if announce:
+                    console.print(f"[green]🔑 Secret loaded: {ref.item}/{ref.field}[/green]")
             except Exception as e:
                 if self.require_secrets:
                     # Live mode - secrets are required
@@ -191,11 +503,33 @@ class SecretsBroker:
 
         SECURITY: Critical for preventing accidental secret exposure.
         """
-        scrubbed = content
-        for secret in secrets.values():
-            if secret:
-                scrubbed = scrubbed.replace(secret, "[REDACTED]")
-        return scrubbed
+        # Nothing to scrub (no-auth tools and mock mode)
+        if not content or not secrets:
+            return content
+
+        # Longest secrets first, so a secret that contains another is redacted whole
+        key = tuple(
+            sorted({secret for secret in secrets.values() if secret}, key=len, reverse=True)
+        )
+        if not key:
+            return content
+
+        with self._scrub_patterns_lock:
+            pattern = self._scrub_patterns.get(key)
+            if pattern is not None:
+                self._scrub_patterns.move_to_end(key)
+
+        if pattern is None:
+            # One alternation pattern scans the content once, whatever the number of
+            # secrets. Case-insensitive, so a secret that was upper- or lower-cased on
+            # its way into the output is still caught.
+            pattern = re.compile("|".join(map(re.escape, key)), re.IGNORECASE)
+            with self._scrub_patterns_lock:
+                self._scrub_patterns[key] = pattern
+                if len(self._scrub_patterns) > SCRUB_PATTERN_CACHE_MAX_ENTRIES:
+                    self._scrub_patterns.popitem(last=False)
+
+        return pattern.sub("[REDACTED]", content)
 
     def execute_tool(self, call: ToolCall) -> ToolResult:
         """
@@ -215,6 +549,8 @@ class SecretsBroker:
             )
 
         executor = self._executors[call.name]
+        # Set once secrets are resolved, so the error path can scrub with the same values
+        secrets: dict[str, str] | None = None
 
         try:
             # Step 1: Resolve secrets (stays in this boundary)
@@ -223,24 +559,34 @@ class SecretsBroker:
             # Step 2: Execute the tool
             result = executor(call.arguments, secrets)
 
-            # Step 3: Scrub output before returning
-            result.content = self._scrub_output(result.content, secrets)
+            # No secrets were handed to the tool, so there is nothing to scrub
+            if not secrets:
+                return result
 
-            return result
+            # Step 3: Scrub output before returning. Build a new result rather than
+            # mutating the executor's (it may be shared); the fields are already valid.
+            return ToolResult.model_construct(
+                success=result.success, content=self._scrub_output(result.content, secrets)
+            )
 
         except Exception as e:
             # Never expose internal errors that might hint at secrets
             error_msg = str(e)
-            # Scrub the error message too
-            if self._secret_refs.get(call.name):
+            # Scrub the error message too. If resolution itself failed, use
+            # whatever secrets were already fetched into the cache.
+            if secrets is None:
                 secrets = {
                     ref.field: self._secret_cache.get(ref.uri, "")
-                    for ref in self._secret_refs[call.name]
+                    for ref in self._secret_refs.get(call.name, ())
                 }
-                error_msg = self._scrub_output(error_msg, secrets)
+            error_msg = self._scrub_output(error_msg, secrets)
 
             return ToolResult(success=False, content=f"Tool execution failed: {error_msg}")
 
     def clear_cache(self):
         """Clear the secret cache. Call this when done with a session."""
         self._secret_cache.clear()
+        # The compiled patterns embed secret values too
+        with self._scrub_patterns_lock:
+            self._scrub_patterns.clear()
+        self.refresh_env()
@@ -8,7 +8,11 @@ IMPORTANT: Tool definitions are visible to the LLM.
 Never include secrets or sensitive implementation details.
 """
 
-from pydantic import BaseModel
+from collections.abc import Callable, Iterable
+from functools import cached_property
+
+import fastjsonschema
+from pydantic import BaseModel, ConfigDict
 
 
 class ToolCall(BaseModel):
@@ -20,7 +24,9 @@ class ToolCall(BaseModel):
 
 
 class ToolResult(BaseModel):
-    """Result of a tool execution."""
+    """Result of a tool execution (immutable, so results can be shared)."""
+
+    model_config = ConfigDict(frozen=True)
 
     success: bool
     content: str
@@ -33,15 +39,62 @@ class ToolDefinition(BaseModel):
     description: str
     parameters: dict  # JSON Schema
 
+    @cached_property
+    def required(self) -> tuple[str, ...]:
+        """Names of the required parameters (computed once per tool)."""
+        return tuple(self.parameters.get("required", []))
+
+    @cached_property
+    def validator(self) -> Callable[[dict], dict]:
+        """Validator for the tool's arguments, compiled from its JSON Schema."""
+        validate: Callable[[dict], dict] = fastjsonschema.compile(self.parameters)
+        return validate
+
 
 # The tool registry - maps tool names to their definitions
 # Populated at runtime by setup_tools() from secure_tools/tool_configs/tools.yml
 # IMPORTANT: This is empty until setup_tools() is called
 tool_registry: dict[str, ToolDefinition] = {}
 
+# Bumped on every registry change, so caches built from the registry know when to rebuild
+_registry_version = 0
+
+
+def registry_version() -> int:
+    """Current version of the tool registry."""
+    return _registry_version
+
+
+def _registry_changed() -> None:
+    global _registry_version
+    _registry_version += 1
+
 
 def register_tool(name: str, description: str, parameters: dict) -> ToolDefinition:
     """Register a tool definition."""
     tool = ToolDefinition(name=name, description=description, parameters=parameters)
+    # Compile the argument validator now so a bad schema fails at startup, not mid-chat
+    tool.validator  # noqa: B018
     tool_registry[name] = tool
+    _registry_changed()
     return tool
+
+
+def register_tools(tools: Iterable[ToolDefinition]) -> None:
+    """
+    Register several tool definitions at once.
+
+    All argument validators are compiled before anything is registered,
+    so a bad schema leaves the registry unchanged.
+    """
+    batch = {tool.name: tool for tool in tools}
+    for tool in batch.values():
+        tool.validator  # noqa: B018
+    tool_registry.update(batch)
+    _registry_changed()
+
+
+def clear_registry() -> None:
+    """Remove all registered tool definitions."""
+    tool_registry.clear()
+    _registry_changed()
@@ -14,19 +14,58 @@ SECURITY RULES:
 
 from __future__ import annotations
 
-import json
+import atexit
+from collections.abc import Mapping
+from functools import cache
+from types import MappingProxyType
 
 import httpx
+import orjson
 
 from . import ToolResult
 
 # Timeout for external API requests
 API_REQUEST_TIMEOUT_SECONDS = 10
 
+
+def _to_json(data: object) -> str:
+    """Serialize a tool result payload to a JSON string."""
+    return orjson.dumps(data).decode()
+
+
+@cache
+def _weather_client() -> httpx.Client:
+    """
+    HTTP client shared by all weather API calls.
+
+    Created on first use (mock mode never needs it) and kept alive so
+    repeated calls reuse the pooled connection instead of paying for
+    DNS, TCP and TLS setup every time.
+    """
+    client = httpx.Client(
+        timeout=API_REQUEST_TIMEOUT_SECONDS,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+    atexit.register(client.close)
+    return client
+
+
 # =============================================================================
 # Weather Tool Executor
 # =============================================================================
 
+# Mock weather by lower-cased city name: (temperature in °C, condition)
+_MOCK_WEATHER: Mapping[str, tuple[int, str]] = MappingProxyType(
+    {
+        "paris": (12, "cloudy"),
+        "london": (8, "rainy"),
+        "tokyo": (18, "sunny"),
+        "new york": (5, "windy"),
+        "san francisco": (15, "foggy"),
+    }
+)
+_MOCK_WEATHER_DEFAULT = (20, "partly cloudy")
+
 
 def execute_get_current_weather(arguments: dict, secrets: dict) -> ToolResult:
     """
@@ -63,21 +102,10 @@ def execute_get_current_weather(arguments: dict, secrets: dict) -> ToolResult:
 
 def _mock_weather(location: str, temp_format: str) -> ToolResult:
     """Mock weather response for testing without API keys."""
-    # Simple mock data based on location
-    mock_data: dict[str, dict[str, int | str]] = {
-        "paris": {"temp_c": 12, "condition": "cloudy"},
-        "london": {"temp_c": 8, "condition": "rainy"},
-        "tokyo": {"temp_c": 18, "condition": "sunny"},
-        "new york": {"temp_c": 5, "condition": "windy"},
-        "san francisco": {"temp_c": 15, "condition": "foggy"},
-    }
-
     # Normalize location for lookup
     loc_key = location.lower().split(",")[0].strip()
-    data = mock_data.get(loc_key, {"temp_c": 20, "condition": "partly cloudy"})
+    temp_c, condition = _MOCK_WEATHER.get(loc_key, _MOCK_WEATHER_DEFAULT)
 
-    temp_c = data["temp_c"]
-    assert isinstance(temp_c, int)
     if temp_format == "fahrenheit":
         temp = round(temp_c * 9 / 5 + 32)
         unit = "°F"
@@ -88,11 +116,11 @@ def _mock_weather(location: str, temp_format: str) -> ToolResult:
     result = {
         "location": location,
         "temperature": f"{temp}{unit}",
-        "condition": data["condition"],
+        "condition": condition,
         "source": "mock_data",
     }
 
-    return ToolResult(success=True, content=json.dumps(result))
+    return ToolResult(success=True, content=_to_json(result))
 
 
 def _real_weather_api(location: str, temp_format: str, api_key: str) -> ToolResult:
@@ -111,10 +139,9 @@ def _real_weather_api(location: str, temp_format: str, api_key: str) -> ToolResu
         "units": units,
     }
 
-    with httpx.Client(timeout=API_REQUEST_TIMEOUT_SECONDS) as client:
-        response = client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+    response = _weather_client().get(url, params=params)
+    response.raise_for_status()
+    data = response.json()
 
     # Extract only non-sensitive information
     result = {
@@ -126,7 +153,7 @@ def _real_weather_api(location: str, temp_format: str, api_key: str) -> ToolResu
     }
 
     # IMPORTANT: Do not include the API key or any auth info in the result
-    return ToolResult(success=True, content=json.dumps(result))
+    return ToolResult(success=True, content=_to_json(result))
 
 
 # =============================================================================
@@ -152,7 +179,7 @@ def execute_get_protected_status(arguments: dict, secrets: dict) -> ToolResult:
         # Mock mode for testing
         return ToolResult(
             success=True,
-            content=json.dumps(
+            content=_to_json(
                 {
                     "project": project,
                     "status": "active",
@@ -170,7 +197,7 @@ def execute_get_protected_status(arguments: dict, secrets: dict) -> ToolResult:
     # For now, return mock data
     return ToolResult(
         success=True,
-        content=json.dumps(
+        content=_to_json(
             {
                 "project": project,
                 "status": "active",
@@ -185,6 +212,19 @@ def execute_get_protected_status(arguments: dict, secrets: dict) -> ToolResult:
 # List Services Tool Executor
 # =============================================================================
 
+# The service list never changes, so a single result is built once and shared
+_LIST_SERVICES_RESULT = ToolResult(
+    success=True,
+    content=_to_json(
+        {
+            "services": [
+                {"name": "weather", "description": "Get current weather for any location"},
+                {"name": "protected_status", "description": "Check project protection status"},
+            ]
+        }
+    ),
+)
+
 
 def execute_list_available_services(arguments: dict, secrets: dict) -> ToolResult:
     """
@@ -193,12 +233,7 @@ def execute_list_available_services(arguments: dict, secrets: dict) -> ToolResul
     This demonstrates a tool that doesn't need authentication
     but still goes through the secrets broker for consistency.
     """
-    services = [
-        {"name": "weather", "description": "Get current weather for any location"},
-        {"name": "protected_status", "description": "Check project protection status"},
-    ]
-
-    return ToolResult(success=True, content=json.dumps({"services": services}))
+    return _LIST_SERVICES_RESULT
 
 
 # =============================================================================
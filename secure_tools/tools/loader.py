@@ -5,44 +5,109 @@ This module decouples tool definitions from code, making tools
 more modular and configurable without code changes.
 """
 
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+from functools import cache
 from importlib import resources
 from pathlib import Path
+from typing import IO
 
+import orjson
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import TypeAdapter
 
-from ..secrets_broker import SecretReference, SecretsBroker
-from . import register_tool, tool_registry
+from ..secrets_broker import SecretReference, SecretsBroker, ToolExecutor
+from . import ToolDefinition, clear_registry, register_tools
 from .executors import TOOL_EXECUTORS
 
+# Prefer libyaml's C loader (much faster to parse), falling back to the
+# pure-Python loader when PyYAML was built without libyaml
+_SafeLoader: type[yaml.SafeLoader] | type[yaml.CSafeLoader]
+try:
+    _SafeLoader = yaml.CSafeLoader
+except AttributeError:
+    _SafeLoader = yaml.SafeLoader
 
-class SecretConfig(BaseModel):
+
+# The config classes are plain dataclasses: they're only read after loading, and
+# user-supplied configs are validated once, up front, through a TypeAdapter.
+
+
+@dataclass(frozen=True, slots=True)
+class SecretConfig:
     """Secret reference configuration from YAML."""
 
     item: str
     field: str = "password"
 
 
-class ToolConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ToolConfig:
     """Tool configuration from YAML."""
 
     description: str
     executor: str
     parameters: dict
-    secrets: list[SecretConfig] = Field(default_factory=list)
-
-
-class ToolsConfig(BaseModel):
+    secrets: list[SecretConfig] = dataclass_field(default_factory=list)
+    # Secret references per vault, built on first use (configs are cached and reused)
+    _refs_by_vault: dict[str, list[SecretReference]] = dataclass_field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def secret_refs(self, vault: str) -> list[SecretReference]:
+        """Get the 1Password references for this tool's secrets in a vault."""
+        refs = self._refs_by_vault.get(vault)
+        if refs is None:
+            refs = [
+                SecretReference(vault=vault, item=secret.item, field=secret.field)
+                for secret in self.secrets
+            ]
+            self._refs_by_vault[vault] = refs
+        return refs
+
+
+@dataclass(frozen=True, slots=True)
+class ToolsConfig:
     """Root configuration for tools.yml."""
 
     tools: dict[str, ToolConfig]
 
 
-def _get_default_config_content() -> str:
+@cache
+def _tools_config_adapter() -> TypeAdapter[ToolsConfig]:
+    """Validator for user-supplied configs (built on first use)."""
+    return TypeAdapter(ToolsConfig)
+
+
+# Configs up to this size are read in one go; larger ones are parsed as a
+# buffered stream so the whole file never has to sit in memory at once
+STREAM_PARSE_MIN_BYTES = 4096
+STREAM_PARSE_BUFFER_BYTES = 65536
+
+# The packaged default config, resolved once (works from source or an installed package)
+_DEFAULT_RESOURCE = resources.files("secure_tools.tool_configs").joinpath("tools.yml")
+
+# Parsed configs by source, with the file's mtime when they were parsed
+_config_cache: dict[str, tuple[int | None, ToolsConfig]] = {}
+
+
+def _load_yaml(stream: str | bytes | IO) -> object:
+    """Parse a YAML document with the safe loader."""
+    # _SafeLoader is always a (C)SafeLoader, which can't instantiate arbitrary objects
+    return yaml.load(stream, Loader=_SafeLoader)  # noqa: S506  # nosec B506
+
+
+def _get_default_config_mtime() -> int | None:
+    """Modification time of the default tools.yml, or None if it isn't a plain file."""
+    if isinstance(_DEFAULT_RESOURCE, Path):
+        return _DEFAULT_RESOURCE.stat().st_mtime_ns
+    return None
+
+
+def _get_default_config_content() -> bytes:
     """Load the default tools.yml from package resources."""
-    # Use importlib.resources to load config from within the package
-    # This works whether running from source or installed as a package
-    return resources.files("secure_tools.tool_configs").joinpath("tools.yml").read_text()
+    # Raw bytes: the YAML parser decodes them itself, so no intermediate str is needed
+    return _DEFAULT_RESOURCE.read_bytes()
 
 
 def _validate_raw_config(raw_config: object, source: str) -> dict:
@@ -82,12 +147,39 @@ def _validate_raw_config(raw_config: object, source: str) -> dict:
     return raw_config
 
 
+def _construct_builtin_config(raw_config: dict) -> ToolsConfig:
+    """
+    Build the packaged config without validation.
+
+    The default tools.yml ships with the code (and is covered by the tests),
+    so validating it on every startup is wasted work. User-supplied configs
+    are always validated.
+    """
+    return ToolsConfig(
+        tools={
+            name: ToolConfig(
+                description=tool["description"],
+                executor=tool["executor"],
+                parameters=tool["parameters"],
+                secrets=[SecretConfig(**secret) for secret in tool.get("secrets") or []],
+            )
+            for name, tool in raw_config["tools"].items()
+        }
+    )
+
+
 def load_tools_config(config_path: Path | None = None) -> ToolsConfig:
     """
     Load tools configuration from YAML file.
 
+    A config path ending in .json is parsed as JSON instead, which is much
+    faster to load than YAML.
+
+    Parsed configs are cached per file and reused until the file's
+    modification time changes.
+
     Args:
-        config_path: Path to tools.yml. If None, loads the default
+        config_path: Path to tools.yml (or tools.json). If None, loads the default
                     config from the package (secure_tools/tool_configs/tools.yml)
 
     Returns:
@@ -96,24 +188,51 @@ def load_tools_config(config_path: Path | None = None) -> ToolsConfig:
     Raises:
         FileNotFoundError: If config file doesn't exist
         ValueError: If config structure is invalid or missing required fields
+                    (including malformed JSON)
     """
     if config_path is not None:
         # Load from explicit path
-        if not config_path.exists():
-            raise FileNotFoundError(f"Tools config not found: {config_path}")
-        with open(config_path) as f:
-            raw_config = yaml.safe_load(f)
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Tools config not found: {config_path}") from e
         source = str(config_path)
+        # absolute() is pure path arithmetic; resolve() would lstat every component
+        cache_key = str(config_path.absolute())
+        mtime: int | None = stat.st_mtime_ns
+    else:
+        source = "secure_tools/tool_configs/tools.yml"
+        cache_key = source
+        mtime = _get_default_config_mtime()
+
+    cached = _config_cache.get(cache_key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    if config_path is not None and config_path.suffix == ".json":
+        # JSON configs (e.g. generated by tooling) skip the YAML parser entirely
+        raw_config = orjson.loads(config_path.read_bytes())
+    elif config_path is not None:
+        # Load from explicit path
+        if stat.st_size < STREAM_PARSE_MIN_BYTES:
+            raw_config = _load_yaml(config_path.read_bytes())
+        else:
+            with open(config_path, "rb", buffering=STREAM_PARSE_BUFFER_BYTES) as f:
+                raw_config = _load_yaml(f)
     else:
         # Load from package resources (default)
         content = _get_default_config_content()
-        raw_config = yaml.safe_load(content)
-        source = "secure_tools/tool_configs/tools.yml"
+        raw_config = _load_yaml(content)
 
     # Validate structure before Pydantic parsing
     validated_config = _validate_raw_config(raw_config, source)
 
-    return ToolsConfig(**validated_config)
+    if config_path is None:
+        tools_config = _construct_builtin_config(validated_config)
+    else:
+        tools_config = _tools_config_adapter().validate_python(validated_config)
+    _config_cache[cache_key] = (mtime, tools_config)
+    return tools_config
 
 
 def setup_tools_from_config(
@@ -133,41 +252,44 @@ def setup_tools_from_config(
         List of registered tool names
     """
     config = load_tools_config(config_path)
-    registered_tools: list[str] = []
+    definitions: list[ToolDefinition] = []
+    executions: list[tuple[str, ToolExecutor, list[SecretReference] | None]] = []
 
     for tool_name, tool_config in config.tools.items():
         # Validate executor exists
-        if tool_config.executor not in TOOL_EXECUTORS:
+        executor = TOOL_EXECUTORS.get(tool_config.executor)
+        if executor is None:
             raise ValueError(
                 f"Unknown executor '{tool_config.executor}' for tool '{tool_name}'. "
-                f"Available: {list(TOOL_EXECUTORS.keys())}"
+                f"Available: {list(TOOL_EXECUTORS)}"
             )
 
-        # Register tool definition (for LLM)
-        register_tool(
-            name=tool_name,
-            description=tool_config.description,
-            parameters=tool_config.parameters,
+        # Tool definition (for LLM)
+        definitions.append(
+            ToolDefinition(
+                name=tool_name,
+                description=tool_config.description,
+                parameters=tool_config.parameters,
+            )
         )
 
-        # Build secret references
-        secret_refs = [
-            SecretReference(vault=vault, item=secret.item, field=secret.field)
-            for secret in tool_config.secrets
-        ]
-
-        # Register with secrets broker (for execution)
-        broker.register_tool(
-            name=tool_name,
-            executor=TOOL_EXECUTORS[tool_config.executor],
-            secrets=secret_refs if secret_refs else None,
-        )
+        # Executor and secret references (for execution; None for tools without secrets)
+        secret_refs = tool_config.secret_refs(vault) if tool_config.secrets else None
+        executions.append((tool_name, executor, secret_refs))
+
+    # Register everything in one go, only once the whole config checked out
+    register_tools(definitions)
+    broker.register_tools(executions)
+
+    return list(config.tools)
 
-        registered_tools.append(tool_name)
 
-    return registered_tools
+def clear_config_cache() -> None:
+    """Forget all parsed tool configs, so the next load re-reads them."""
+    _config_cache.clear()
 
 
 def clear_tool_registry() -> None:
-    """Clear the tool registry. Useful for testing."""
-    tool_registry.clear()
+    """Clear the tool registry and the config cache. Useful for testing."""
+    clear_registry()
+    clear_config_cache()
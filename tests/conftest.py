@@ -0,0 +1,55 @@
+"""Shared test fixtures."""
+
+from collections.abc import Callable, Iterable
+from functools import cache
+
+import httpx
+import pytest
+
+from secure_tools.orchestrator import Orchestrator
+from secure_tools.tools import ToolResult
+from secure_tools.tools.executors import execute_get_current_weather
+
+
+def _assert_not_leaked(content: str, secrets: str | Iterable[str]) -> None:
+    """Assert that none of the secrets appear anywhere in the content."""
+    if isinstance(secrets, str):
+        secrets = (secrets,)
+    # Encode once and search the raw bytes; stops at the first leaked secret
+    buf = content.encode()
+    for secret in secrets:
+        assert buf.find(secret.encode()) == -1, "secret leaked into output"
+
+
+@pytest.fixture
+def assert_not_leaked() -> Callable[[str, str | Iterable[str]], None]:
+    """Check that secrets were kept out of a tool's output."""
+    return _assert_not_leaked
+
+
+@cache
+def _mock_weather(location: str, unit: str = "celsius") -> ToolResult:
+    """Mock-mode weather (no API key), computed once per location and unit."""
+    # Safe to share: ToolResult is frozen
+    return execute_get_current_weather(arguments={"location": location, "format": unit}, secrets={})
+
+
+@pytest.fixture
+def weather() -> Callable[..., ToolResult]:
+    """Get mock-mode weather results, shared across tests."""
+    return _mock_weather
+
+
+def _mock_ollama(
+    orchestrator: Orchestrator, handler: Callable[[httpx.Request], httpx.Response]
+) -> None:
+    """Serve the orchestrator's Ollama requests from a handler instead of the network."""
+    orchestrator.client = httpx.AsyncClient(
+        base_url="http://ollama.test", transport=httpx.MockTransport(handler)
+    )
+
+
+@pytest.fixture
+def mock_ollama() -> Callable[[Orchestrator, Callable[[httpx.Request], httpx.Response]], None]:
+    """Point an orchestrator's Ollama client at a mock request handler."""
+    return _mock_ollama
@@ -4,15 +4,21 @@ Tests for the YAML tool configuration loader.
 Verifies that tools are correctly loaded from config/tools.yml.
 """
 
-import tempfile
+import json
+import os
 from pathlib import Path
 
 import pytest
+import yaml
 
 from secure_tools.secrets_broker import SecretsBroker
 from secure_tools.tools import tool_registry
 from secure_tools.tools.loader import (
     ToolsConfig,
+    _construct_builtin_config,
+    _get_default_config_content,
+    _tools_config_adapter,
+    clear_config_cache,
     clear_tool_registry,
     load_tools_config,
     setup_tools_from_config,
@@ -51,57 +57,94 @@ class TestLoadToolsConfig:
 
         assert list_services.secrets == []
 
+    def test_builtin_config_matches_validated_config(self):
+        """The unvalidated fast path should build the same config as full validation."""
+        raw = yaml.safe_load(_get_default_config_content())
+
+        fast = _construct_builtin_config(raw)
+        validated = _tools_config_adapter().validate_python(raw)
+
+        assert fast == validated
+
     def test_missing_config_raises_error(self):
         """Should raise FileNotFoundError for missing config."""
         with pytest.raises(FileNotFoundError):
             load_tools_config(Path("/nonexistent/tools.yml"))
 
-    def test_invalid_yaml_raises_error(self):
+    def test_invalid_yaml_raises_error(self, tmp_path):
         """Should raise error for invalid YAML."""
-        import yaml
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write("invalid: yaml: content: [")
-            f.flush()
+        path = tmp_path / "tools.yml"
+        path.write_text("invalid: yaml: content: [")
 
-            with pytest.raises(yaml.YAMLError):
-                load_tools_config(Path(f.name))
+        with pytest.raises(yaml.YAMLError):
+            load_tools_config(path)
 
-    def test_empty_file_raises_value_error(self):
+    def test_empty_file_raises_value_error(self, tmp_path):
         """Should raise ValueError for empty config file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write("")
-            f.flush()
+        path = tmp_path / "tools.yml"
+        path.write_text("")
 
-            with pytest.raises(ValueError, match="empty or contains no data"):
-                load_tools_config(Path(f.name))
+        with pytest.raises(ValueError, match="empty or contains no data"):
+            load_tools_config(path)
 
-    def test_non_mapping_raises_value_error(self):
+    def test_non_mapping_raises_value_error(self, tmp_path):
         """Should raise ValueError when top-level is not a mapping."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write("- item1\n- item2\n")
-            f.flush()
+        path = tmp_path / "tools.yml"
+        path.write_text("- item1\n- item2\n")
 
-            with pytest.raises(ValueError, match="must be a mapping at the top level"):
-                load_tools_config(Path(f.name))
+        with pytest.raises(ValueError, match="must be a mapping at the top level"):
+            load_tools_config(path)
 
-    def test_missing_tools_key_raises_value_error(self):
+    def test_missing_tools_key_raises_value_error(self, tmp_path):
         """Should raise ValueError when 'tools' key is missing."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write("other_key: value\n")
-            f.flush()
+        path = tmp_path / "tools.yml"
+        path.write_text("other_key: value\n")
 
-            with pytest.raises(ValueError, match="must contain a top-level 'tools' key"):
-                load_tools_config(Path(f.name))
+        with pytest.raises(ValueError, match="must contain a top-level 'tools' key"):
+            load_tools_config(path)
 
-    def test_tools_not_mapping_raises_value_error(self):
+    def test_tools_not_mapping_raises_value_error(self, tmp_path):
         """Should raise ValueError when 'tools' is not a mapping."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write("tools:\n  - tool1\n  - tool2\n")
-            f.flush()
+        path = tmp_path / "tools.yml"
+        path.write_text("tools:\n  - tool1\n  - tool2\n")
+
+        with pytest.raises(ValueError, match="must be a mapping of tool names"):
+            load_tools_config(path)
+
+    def test_loads_json_config(self, tmp_path):
+        """A .json config should load the same as its YAML equivalent."""
+        path = tmp_path / "tools.json"
+        path.write_text(json.dumps(yaml.safe_load(_get_default_config_content())))
+
+        assert load_tools_config(path) == load_tools_config()
+
+    def test_invalid_json_raises_value_error(self, tmp_path):
+        """Should raise ValueError for malformed JSON."""
+        path = tmp_path / "tools.json"
+        path.write_text('{"tools": ')
+
+        with pytest.raises(ValueError):
+            load_tools_config(path)
+
+    def test_parsed_config_is_cached(self):
+        """Loading the same unchanged config twice should reuse the parsed result."""
+        clear_config_cache()
+
+        assert load_tools_config() is load_tools_config()
+
+    def test_modified_config_is_reparsed(self, tmp_path):
+        """A config file should be re-read once its modification time changes."""
+        tools_yml = "tools:\n  {name}:\n    description: d\n    executor: e\n    parameters: {{}}\n"
+        path = tmp_path / "tools.yml"
+        path.write_text(tools_yml.format(name="first_tool"))
+
+        assert "first_tool" in load_tools_config(path).tools
 
-            with pytest.raises(ValueError, match="must be a mapping of tool names"):
-                load_tools_config(Path(f.name))
+        path.write_text(tools_yml.format(name="second_tool"))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert "second_tool" in load_tools_config(path).tools
 
 
 class TestSetupToolsFromConfig:
@@ -140,10 +183,21 @@ class TestSetupToolsFromConfig:
         assert refs[0].item == "WeatherAPI"
         assert refs[0].field == "api_key"
 
-    def test_invalid_executor_raises_error(self):
+    def test_secret_references_are_built_once_per_vault(self):
+        """Repeated setups should reuse the references built for each vault."""
+        first, second, other = SecretsBroker(), SecretsBroker(), SecretsBroker()
+        setup_tools_from_config(first, vault="TestVault")
+        setup_tools_from_config(second, vault="TestVault")
+        setup_tools_from_config(other, vault="OtherVault")
+
+        refs = first._secret_refs["get_current_weather"]
+        assert second._secret_refs["get_current_weather"] is refs
+        assert other._secret_refs["get_current_weather"][0].vault == "OtherVault"
+
+    def test_invalid_executor_raises_error(self, tmp_path):
         """Should raise error for unknown executor."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write("""
+        path = tmp_path / "tools.yml"
+        path.write_text("""
 tools:
   bad_tool:
     description: "A tool with invalid executor"
@@ -154,11 +208,32 @@ tools:
       required: []
     secrets: []
 """)
-            f.flush()
 
-            broker = SecretsBroker()
-            with pytest.raises(ValueError, match="Unknown executor"):
-                setup_tools_from_config(broker, config_path=Path(f.name))
+        broker = SecretsBroker()
+        with pytest.raises(ValueError, match="Unknown executor"):
+            setup_tools_from_config(broker, config_path=path)
+
+    def test_invalid_config_registers_nothing(self, tmp_path):
+        """A config that fails part-way should not leave some tools registered."""
+        path = tmp_path / "tools.yml"
+        path.write_text("""
+tools:
+  good_tool:
+    description: "A valid tool"
+    executor: "list_available_services"
+    parameters: {}
+  bad_tool:
+    description: "A tool with invalid executor"
+    executor: "nonexistent_executor"
+    parameters: {}
+""")
+
+        broker = SecretsBroker()
+        with pytest.raises(ValueError, match="Unknown executor"):
+            setup_tools_from_config(broker, config_path=path)
+
+        assert "good_tool" not in tool_registry
+        assert "good_tool" not in broker._executors
 
 
 class TestClearToolRegistry:
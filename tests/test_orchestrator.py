@@ -4,11 +4,18 @@ Tests for the Orchestrator.
 These tests verify the LLM-facing component's behaviour.
 """
 
+import asyncio
+import json
+import threading
+
+import httpx
 import pytest
+from pydantic import ValidationError
 
-from secure_tools.config import config
-from secure_tools.orchestrator import Message, Orchestrator
+from secure_tools.config import OllamaConfig, config
+from secure_tools.orchestrator import OllamaResponseError, Orchestrator
 from secure_tools.secrets_broker import SecretsBroker
+from secure_tools.tools import ToolCall, ToolResult, register_tool
 from secure_tools.tools.loader import clear_tool_registry
 from secure_tools.tools.setup import setup_tools
 
@@ -52,6 +59,19 @@ class TestOrchestrator:
         with pytest.raises(ValueError, match="Missing required parameter"):
             self.orchestrator._validate_tool_call(tool_call)
 
+    def test_validate_tool_call_checks_param_types(self):
+        """Arguments must match the types declared in the tool's schema."""
+        tool_call = {
+            "id": "test",
+            "function": {
+                "name": "get_current_weather",
+                "arguments": {"location": 42, "format": "celsius"},
+            },
+        }
+
+        with pytest.raises(ValueError, match="Invalid arguments for tool 'get_current_weather'"):
+            self.orchestrator._validate_tool_call(tool_call)
+
     def test_validate_tool_call_accepts_valid_call(self):
         """Valid tool calls should pass validation."""
         tool_call = {
@@ -74,6 +94,7 @@ class TestOrchestrator:
         config.security.allowed_tools = ["list_available_services"]
 
         try:
+            self.orchestrator.invalidate_tool_cache()
             tools = self.orchestrator.get_tool_definitions()
             tool_names = [t["function"]["name"] for t in tools]
 
@@ -82,9 +103,51 @@ class TestOrchestrator:
         finally:
             config.security.allowed_tools = original_allowed
 
+    def test_validate_tool_call_enforces_nicelist(self):
+        """Registered tools outside the nicelist should be rejected."""
+        original_allowed = config.security.allowed_tools
+        config.security.allowed_tools = ["list_available_services"]
+        tool_call = {
+            "id": "test",
+            "function": {
+                "name": "get_current_weather",
+                "arguments": {"location": "Paris", "format": "celsius"},
+            },
+        }
+
+        try:
+            self.orchestrator.invalidate_tool_cache()
+            with pytest.raises(ValueError, match="Tool not allowed"):
+                self.orchestrator._validate_tool_call(tool_call)
+        finally:
+            config.security.allowed_tools = original_allowed
+
+    def test_invalidate_tool_cache_applies_nicelist(self):
+        """Cached tool definitions should pick up nicelist changes on invalidation."""
+        original_allowed = config.security.allowed_tools
+        config.security.allowed_tools = ["list_available_services"]
+
+        try:
+            self.orchestrator.invalidate_tool_cache()
+            cached = self.orchestrator._tool_defs_payload
+
+            assert [t["function"]["name"] for t in cached] == ["list_available_services"]
+        finally:
+            config.security.allowed_tools = original_allowed
+
+    def test_tool_definitions_follow_registry_changes(self):
+        """Definitions should be reused until the registry changes, then rebuilt."""
+        tools = self.orchestrator.get_tool_definitions()
+        assert self.orchestrator.get_tool_definitions() is tools
+
+        register_tool("extra_tool", "An extra tool.", {"type": "object", "properties": {}})
+        names = [t["function"]["name"] for t in self.orchestrator.get_tool_definitions()]
+
+        assert "extra_tool" in names
+
     def test_reset_clears_conversation(self):
         """Reset should clear all state."""
-        self.orchestrator.conversation.append(Message(role="user", content="test"))
+        self.orchestrator.conversation.append({"role": "user", "content": "test"})
         self.orchestrator.tool_call_count = 5
 
         self.orchestrator.reset()
@@ -118,3 +181,404 @@ class TestToolCallLimit:
                     )
         finally:
             config.security.max_tool_calls = original_limit
+
+
+class TestChatToolExecution:
+    """Test tool execution within the chat loop."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_ollama):
+        """Set up an orchestrator whose Ollama client is served by a mock transport."""
+        self.mock_ollama = mock_ollama
+        clear_tool_registry()
+        self.broker = SecretsBroker()
+        setup_tools(self.broker)
+        self.orchestrator = Orchestrator(self.broker)
+        self.requests: list[dict] = []
+
+        tool_calls = [
+            {
+                "id": "call_weather",
+                "function": {
+                    "name": "get_current_weather",
+                    "arguments": {"location": "Paris", "format": "celsius"},
+                },
+            },
+            {"id": "call_evil", "function": {"name": "evil_tool", "arguments": {}}},
+            {"id": "call_services", "function": {"name": "list_available_services"}},
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(json.loads(request.content))
+            if len(self.requests) == 1:
+                message = {"role": "assistant", "content": "", "tool_calls": tool_calls}
+            else:
+                message = {"role": "assistant", "content": "Done"}
+            return httpx.Response(200, json={"message": message})
+
+        mock_ollama(self.orchestrator, handler)
+
+    def teardown_method(self):
+        """Release the orchestrator's client and event loop."""
+        self.orchestrator.close()
+
+    def test_tool_results_preserve_call_order(self):
+        """Tool results should be returned in the order the LLM requested them."""
+        response = self.orchestrator.chat("What's the weather in Paris?")
+
+        assert response == "Done"
+        tool_messages = [m for m in self.orchestrator.conversation if m["role"] == "tool"]
+        assert [m["tool_call_id"] for m in tool_messages] == [
+            "call_weather",
+            "call_evil",
+            "call_services",
+        ]
+        assert "Paris" in tool_messages[0]["content"]
+        assert "Unknown tool requested" in tool_messages[1]["content"]
+        assert "services" in tool_messages[2]["content"]
+
+    def test_tool_definitions_sent_with_each_request(self):
+        """Every Ollama request should carry the tool definitions."""
+        self.orchestrator.chat("What's the weather in Paris?")
+
+        for request in self.requests:
+            names = {t["function"]["name"] for t in request["tools"]}
+            assert "get_current_weather" in names
+
+    def test_tool_results_sent_back_to_ollama(self):
+        """The follow-up request should include every tool result."""
+        self.orchestrator.chat("What's the weather in Paris?")
+
+        follow_up = self.requests[1]["messages"]
+        assert [m["role"] for m in follow_up] == [
+            "system",
+            "user",
+            "assistant",
+            "tool",
+            "tool",
+            "tool",
+        ]
+
+    def test_failed_tool_call_becomes_error_result(self):
+        """An exception while executing a tool should become an error result."""
+
+        def failing_execute(tool_call):
+            raise RuntimeError("boom")
+
+        self.orchestrator._execute_tool = failing_execute
+        call = ToolCall(id="a", name="list_available_services", arguments={})
+
+        result = asyncio.run(self.orchestrator._execute_tool_async(call))
+
+        assert result.success is False
+        assert result.content == "Error executing tool: boom"
+
+    def test_failed_call_keeps_sibling_results(self):
+        """A failing call should not discard results of calls that ran alongside it."""
+        execute_tool = self.orchestrator._execute_tool
+
+        def execute(tool_call):
+            if tool_call.id == "call_weather":
+                raise RuntimeError("boom")
+            return execute_tool(tool_call)
+
+        self.orchestrator._execute_tool = execute
+
+        self.orchestrator.chat("What's the weather in Paris?")
+
+        tool_messages = [m for m in self.orchestrator.conversation if m["role"] == "tool"]
+        assert tool_messages[0]["content"] == "Error executing tool: boom"
+        assert "services" in tool_messages[2]["content"]
+
+    def test_tool_call_limit_stops_the_turn(self):
+        """Exceeding the tool call limit mid-stream should raise the limit error itself."""
+        original_limit = config.security.max_tool_calls
+        config.security.max_tool_calls = 2
+        try:
+            with pytest.raises(RuntimeError, match="Tool call limit exceeded"):
+                self.orchestrator.chat("What's the weather in Paris?")
+        finally:
+            config.security.max_tool_calls = original_limit
+
+    def test_interrupted_turn_is_rolled_back(self):
+        """Ctrl-C during a turn should leave the conversation unchanged."""
+
+        def interrupting_handler(request: httpx.Request) -> httpx.Response:
+            raise KeyboardInterrupt
+
+        self.mock_ollama(self.orchestrator, interrupting_handler)
+
+        with pytest.raises(KeyboardInterrupt):
+            self.orchestrator.chat("What's the weather in Paris?")
+
+        assert self.orchestrator.conversation == []
+
+    def test_turns_share_one_client_and_loop(self):
+        """Consecutive turns should reuse the same client on the same event loop."""
+        client = self.orchestrator.client
+
+        self.orchestrator.chat("What's the weather in Paris?")
+        self.orchestrator.chat("And in London?")
+
+        assert self.orchestrator.client is client
+        assert len(self.requests) == 3
+
+
+class TestResponseCache:
+    """Test the prompt -> response cache for seeded opening prompts."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_ollama):
+        """Set up an orchestrator whose Ollama client counts requests."""
+        clear_tool_registry()
+        self.orchestrator = Orchestrator(SecretsBroker())
+        self.request_count = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.request_count += 1
+            message = {"role": "assistant", "content": f"Answer {self.request_count}"}
+            return httpx.Response(200, json={"message": message})
+
+        mock_ollama(self.orchestrator, handler)
+        self.original_seed = config.ollama.seed
+        self.original_cache_enabled = config.ollama.cache_enabled
+        config.ollama.seed = 42
+        config.ollama.cache_enabled = True
+
+    def teardown_method(self):
+        """Restore config and release the orchestrator."""
+        config.ollama.seed = self.original_seed
+        config.ollama.cache_enabled = self.original_cache_enabled
+        self.orchestrator.close()
+
+    def test_repeated_opening_prompt_hits_cache(self):
+        """The same opening prompt should be answered from the cache."""
+        first = self.orchestrator.chat("Hello")
+        self.orchestrator.reset()
+        second = self.orchestrator.chat("Hello")
+
+        assert first == second == "Answer 1"
+        assert self.request_count == 1
+        assert self.orchestrator.conversation == [
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Answer 1"},
+        ]
+
+    def test_registry_change_invalidates_cache(self):
+        """A cached response made with the old tool set should not be reused."""
+        self.orchestrator.chat("Hello")
+        self.orchestrator.reset()
+        register_tool("extra_tool", "An extra tool.", {"type": "object", "properties": {}})
+
+        assert self.orchestrator.chat("Hello") == "Answer 2"
+
+    def test_follow_up_messages_are_not_cached(self):
+        """Messages after the first turn depend on history and must reach Ollama."""
+        self.orchestrator.chat("Hello")
+        self.orchestrator.chat("Hello")
+
+        assert self.request_count == 2
+
+    def test_cache_requires_seed(self):
+        """Without a seed the output is non-deterministic, so nothing is cached."""
+        config.ollama.seed = None
+
+        self.orchestrator.chat("Hello")
+        self.orchestrator.reset()
+        self.orchestrator.chat("Hello")
+
+        assert self.request_count == 2
+
+
+class TestStreaming:
+    """Test parsing of Ollama's streamed chat responses."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_ollama):
+        """Set up an orchestrator without tools."""
+        self.mock_ollama = mock_ollama
+        clear_tool_registry()
+        self.orchestrator = Orchestrator(SecretsBroker())
+
+    def teardown_method(self):
+        """Release the orchestrator's client and event loop."""
+        self.orchestrator.close()
+
+    def serve(self, *chunks: dict, status_code: int = 200):
+        """Serve the given chunks as a JSON-lines stream."""
+        body = "\n".join(json.dumps(chunk) for chunk in chunks).encode()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(status_code, content=body)
+
+        self.mock_ollama(self.orchestrator, handler)
+
+    def test_content_fragments_are_assembled_and_streamed(self):
+        """Fragments should reach the callback and form the final response."""
+        self.serve(
+            {"message": {"role": "assistant", "content": "Hello"}, "done": False},
+            {"message": {"role": "assistant", "content": ", world"}, "done": False},
+            {"message": {"role": "assistant", "content": ""}, "done": True},
+        )
+        fragments: list[str] = []
+
+        response = self.orchestrator.chat("Hi", on_content=fragments.append)
+
+        assert response == "Hello, world"
+        assert fragments == ["Hello", ", world"]
+
+    def test_tool_calls_split_across_chunks_are_merged(self):
+        """Parallel tool calls sent in separate chunks should all be returned."""
+        call_a = {"function": {"name": "list_available_services", "arguments": {}}}
+        call_b = {"function": {"name": "get_protected_status", "arguments": {"project": "x"}}}
+        self.serve(
+            {"message": {"role": "assistant", "content": "", "tool_calls": [call_a]}},
+            {"message": {"role": "assistant", "content": "", "tool_calls": [call_b]}},
+            {"message": {"role": "assistant", "content": ""}, "done": True},
+        )
+
+        response = asyncio.run(self.orchestrator._call_ollama([]))
+
+        assert response["message"]["tool_calls"] == [call_a, call_b]
+        assert response["message"]["content"] == ""
+
+    def test_tool_calls_start_before_the_stream_ends(self):
+        """A tool call should be running while the rest of the response streams in."""
+        setup_tools(self.orchestrator.secrets_broker)
+        started = threading.Event()
+        seen_before_done: list[bool] = []
+        call = {"function": {"name": "list_available_services", "arguments": {}}}
+        self.orchestrator._execute_tool = lambda tool_call: (
+            started.set() or ToolResult(success=True, content="ok")
+        )
+
+        async def stream():
+            yield json.dumps({"message": {"content": "", "tool_calls": [call]}}).encode() + b"\n"
+            seen_before_done.append(await asyncio.to_thread(started.wait, 5))
+            yield json.dumps({"message": {"content": ""}, "done": True}).encode()
+
+        self.mock_ollama(self.orchestrator, lambda request: httpx.Response(200, content=stream()))
+
+        message, contents = asyncio.run(self.orchestrator._call_ollama_and_tools([], None))
+
+        assert seen_before_done == [True]
+        assert message["tool_calls"] == [call]
+        assert contents == ["ok"]
+
+    def test_error_chunk_raises(self):
+        """An error reported mid-stream should raise OllamaResponseError."""
+        self.serve({"error": "model not found"})
+
+        with pytest.raises(OllamaResponseError, match="model not found"):
+            self.orchestrator.chat("Hi")
+
+    def test_invalid_json_chunk_raises(self):
+        """A chunk that isn't valid JSON should raise OllamaResponseError."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=b"not json")
+
+        self.mock_ollama(self.orchestrator, handler)
+
+        with pytest.raises(OllamaResponseError, match="invalid JSON: not json"):
+            self.orchestrator.chat("Hi")
+
+    def test_http_error_includes_body(self):
+        """HTTP errors should include the (truncated) response body."""
+        self.serve({"error": "overloaded"}, status_code=503)
+
+        with pytest.raises(OllamaResponseError, match="HTTP 503.*overloaded"):
+            self.orchestrator.chat("Hi")
+
+
+class TestHistoryWindow:
+    """Test the sliding window over conversation history."""
+
+    def setup_method(self):
+        """Set up an orchestrator with a small history window."""
+        clear_tool_registry()
+        self.orchestrator = Orchestrator(SecretsBroker())
+        self.original_window = config.ollama.history_window
+        config.ollama.history_window = 4
+
+    def teardown_method(self):
+        """Restore the configured window."""
+        config.ollama.history_window = self.original_window
+
+    def test_keeps_first_message_and_recent_messages(self):
+        """The first user message and the most recent messages should be kept."""
+        self.orchestrator.conversation = [
+            {"role": "user" if i % 2 == 0 else "assistant", "content": str(i)} for i in range(8)
+        ]
+
+        self.orchestrator._trim_history()
+
+        assert [m["content"] for m in self.orchestrator.conversation] == ["0", "5", "6", "7"]
+
+    def test_never_keeps_orphaned_tool_results(self):
+        """Tool results whose tool-call message was dropped should be dropped too."""
+        self.orchestrator.conversation = [
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "", "tool_calls": [{"id": "a"}, {"id": "b"}]},
+            {"role": "tool", "content": "a", "tool_call_id": "a"},
+            {"role": "tool", "content": "b", "tool_call_id": "b"},
+            {"role": "assistant", "content": "answer"},
+        ]
+
+        self.orchestrator._trim_history()
+
+        assert [m["content"] for m in self.orchestrator.conversation] == ["first", "answer"]
+
+    def test_zero_window_keeps_full_history(self):
+        """A window of 0 should disable trimming."""
+        config.ollama.history_window = 0
+        self.orchestrator.conversation = [{"role": "user", "content": str(i)} for i in range(20)]
+
+        self.orchestrator._trim_history()
+
+        assert len(self.orchestrator.conversation) == 20
+
+    @pytest.mark.parametrize("window", [1, -1])
+    def test_tiny_window_keeps_latest_message(self, window):
+        """Windows below 2 should still keep the reply that was just produced."""
+        config.ollama.history_window = window
+        self.orchestrator.conversation = [
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "one"},
+            {"role": "user", "content": "again"},
+            {"role": "assistant", "content": "latest"},
+        ]
+
+        self.orchestrator._trim_history()
+
+        assert [m["content"] for m in self.orchestrator.conversation] == ["first", "latest"]
+
+    def test_negative_window_is_rejected(self):
+        """The configured window can't be negative."""
+        with pytest.raises(ValidationError):
+            OllamaConfig(history_window=-1)
+
+
+class TestWarmup:
+    """Test the background model warmup."""
+
+    def test_warmup_ignores_connection_errors(self, monkeypatch):
+        """An unreachable Ollama should not raise from the warmup thread."""
+        requests: list[dict] = []
+
+        def failing_post(url, json, timeout):
+            requests.append({"url": url, **json})
+            raise httpx.ConnectError("connection refused")
+
+        monkeypatch.setattr(httpx, "post", failing_post)
+        orchestrator = Orchestrator(SecretsBroker())
+
+        orchestrator.start_warmup().join(timeout=5)
+
+        assert requests == [
+            {
+                "url": f"{config.ollama.base_url}/api/generate",
+                "model": config.ollama.model,
+                "keep_alive": config.ollama.keep_alive,
+            }
+        ]
@@ -4,43 +4,134 @@ Tests for the Secrets Broker.
 These tests verify the security properties of the trusted boundary.
 """
 
-from secure_tools.secrets_broker import SecretReference, SecretsBroker, ToolResult
+import string
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from secure_tools.config import config
+from secure_tools.secrets_broker import (
+    OnePasswordCLINotFoundError,
+    OnePasswordCLITimeoutError,
+    SecretCache,
+    SecretReference,
+    SecretsBroker,
+    ToolResult,
+)
+from secure_tools.tools import ToolCall
+
+# ToolResult is frozen, so fake executors can all return the same instance
+_OK_RESULT = ToolResult(success=True, content="ok")
+
+
+class _ManualTimer:
+    """Stand-in for threading.Timer that only runs its callback when fired."""
+
+    def __init__(self, function):
+        self.function = function
+        self.started = False
+        self.cancelled = False
+        self.daemon = False
+
+    def start(self):
+        self.started = True
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        if self.started and not self.cancelled:
+            self.function()
+
+
+@pytest.fixture(scope="module")
+def shared_broker():
+    """One broker for the tests that don't replace any of its methods."""
+    return SecretsBroker()
+
+
+@pytest.fixture
+def broker(shared_broker):
+    """The shared broker, with its registrations and caches cleared after each test."""
+    yield shared_broker
+    shared_broker._executors.clear()
+    shared_broker._secret_refs.clear()
+    shared_broker.clear_cache()
 
 
 class TestSecretsBroker:
     """Test the secrets broker security properties."""
 
-    def test_scrub_output_removes_secrets(self):
+    def test_scrub_output_removes_secrets(self, broker, assert_not_leaked):
         """Secrets should be scrubbed from output."""
-        broker = SecretsBroker()
-
         secrets = {"api_key": "super-secret-key-12345"}
         content = "Response includes super-secret-key-12345 in the data"
 
         scrubbed = broker._scrub_output(content, secrets)
 
-        assert "super-secret-key-12345" not in scrubbed
+        assert_not_leaked(scrubbed, "super-secret-key-12345")
         assert "[REDACTED]" in scrubbed
 
-    def test_scrub_output_handles_multiple_secrets(self):
+    def test_scrub_output_handles_multiple_secrets(self, broker):
         """Multiple secrets should all be scrubbed."""
-        broker = SecretsBroker()
-
         secrets = {"api_key": "secret-api-key", "auth_token": "secret-auth-token"}
         content = "Keys: secret-api-key and secret-auth-token"
 
         scrubbed = broker._scrub_output(content, secrets)
 
-        assert "secret-api-key" not in scrubbed
-        assert "secret-auth-token" not in scrubbed
-        assert scrubbed.count("[REDACTED]") == 2
+        # One comparison covers both secrets and the redaction count
+        assert scrubbed == "Keys: [REDACTED] and [REDACTED]"
 
-    def test_unregistered_tool_fails(self):
-        """Calling an unregistered tool should fail safely."""
-        broker = SecretsBroker()
+    def test_scrub_output_redacts_overlapping_secrets_whole(self, broker):
+        """A secret containing another secret should be redacted in full."""
+        secrets = {"short": "abc123", "long": "abc123-extended"}
+        content = "value=abc123-extended other=abc123"
+
+        scrubbed = broker._scrub_output(content, secrets)
+
+        assert scrubbed == "value=[REDACTED] other=[REDACTED]"
+
+    def test_scrub_output_case_insensitive(self, broker):
+        """Secrets should be redacted even if their case was changed."""
+        secrets = {"api_key": "Secret-Key-abc"}
+        content = "upper=SECRET-KEY-ABC lower=secret-key-abc"
+
+        scrubbed = broker._scrub_output(content, secrets)
+
+        assert scrubbed == "upper=[REDACTED] lower=[REDACTED]"
+
+    def test_scrub_patterns_are_cached_per_secret_set(self, broker):
+        """Alternating between tools should reuse each tool's compiled pattern."""
+        broker._scrub_output("a", {"api_key": "secret-a"})
+        broker._scrub_output("b", {"token": "secret-b"})
+        pattern = broker._scrub_patterns[("secret-a",)]
+        broker._scrub_output("a", {"api_key": "secret-a"})
+
+        assert broker._scrub_patterns[("secret-a",)] is pattern
+        assert len(broker._scrub_patterns) == 2
+
+        broker.clear_cache()
+        assert not broker._scrub_patterns
 
-        from secure_tools.tools import ToolCall
+    def test_scrub_pattern_cache_is_thread_safe(self, broker):
+        """Concurrent scrubs that evict each other's patterns should not fail."""
 
+        def scrub(i):
+            secret = f"secret-{i % 64}"
+            return broker._scrub_output(f"value={secret}", {"k": secret})
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(scrub, range(2000)))
+
+        assert set(results) == {"value=[REDACTED]"}
+
+    def test_unregistered_tool_fails(self, broker):
+        """Calling an unregistered tool should fail safely."""
         call = ToolCall(id="test", name="nonexistent_tool", arguments={})
 
         result = broker.execute_tool(call)
@@ -48,39 +139,322 @@ class TestSecretsBroker:
         assert result.success is False
         assert "not registered" in result.content
 
-    def test_executor_receives_secrets(self):
+    def test_executor_receives_secrets(self, broker):
         """Tool executors should receive resolved secrets."""
-        broker = SecretsBroker()
-        received_secrets = {}
+        received_secrets = []
 
         def test_executor(args, secrets):
-            received_secrets.update(secrets)
-            return ToolResult(success=True, content="ok")
+            received_secrets.append(secrets)
+            return _OK_RESULT
 
         # Register without actual 1Password (will have empty secrets)
         broker.register_tool("test_tool", test_executor, secrets=[])
 
-        from secure_tools.tools import ToolCall
-
         call = ToolCall(id="test", name="test_tool", arguments={"foo": "bar"})
 
         result = broker.execute_tool(call)
 
         assert result.success is True
+        assert received_secrets == [{}]
 
+    def test_executor_errors_are_scrubbed(self, broker, assert_not_leaked):
+        """Secrets in an executor's exception message should be redacted."""
+        ref = SecretReference(vault="V", item="Api", field="api_key")
+        broker._secret_cache[ref.uri] = "leaky-secret-value"
 
-class TestSecretReference:
-    """Test secret reference URI generation."""
+        def failing_executor(args, secrets):
+            raise ValueError(f"request failed for key {secrets['api_key']}")
+
+        broker.register_tool("tool", failing_executor, secrets=[ref])
+
+        result = broker.execute_tool(ToolCall(id="test", name="tool", arguments={}))
+
+        assert result.success is False
+        assert_not_leaked(result.content, "leaky-secret-value")
+        assert "[REDACTED]" in result.content
+
+    def test_live_mode_requires_op_cli(self, monkeypatch):
+        """Live mode should fail fast when the 1Password CLI isn't installed."""
+        monkeypatch.setattr("shutil.which", lambda name: None)
+
+        with pytest.raises(OnePasswordCLINotFoundError, match="not found"):
+            SecretsBroker(require_secrets=True)
+
+    def test_op_timeout_raises_timeout_error(self, broker, monkeypatch):
+        """A hung op command should be reported as a timeout, not a generic failure."""
+
+        def hang(cmd, **kwargs):
+            raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+
+        monkeypatch.setattr(broker, "_op_bin", "/usr/bin/op")
+        monkeypatch.setattr("subprocess.run", hang)
+
+        with pytest.raises(OnePasswordCLITimeoutError, match="timed out"):
+            broker.read_secret(SecretReference(vault="V", item="I", field="f"))
+
+    def test_op_env_includes_service_account_token(self, monkeypatch):
+        """The service account token should be passed to op once configured."""
+        monkeypatch.setattr(config.onepassword, "service_account_token", None)
+        broker = SecretsBroker()
+        assert broker._op_env is None
+
+        token = "ops_test_token"  # noqa: S105
+        monkeypatch.setattr(config.onepassword, "service_account_token", token)
+        broker.refresh_env()
+
+        assert broker._op_env["OP_SERVICE_ACCOUNT_TOKEN"] == token
+
+
+# Secrets are ASCII letters and digits; the surrounding text has no letters or digits
+# at all, so it can never (even case-insensitively) contain part of a secret
+_secrets = st.text(alphabet=st.sampled_from(string.ascii_letters + string.digits), min_size=8)
+_surrounding_text = st.text(
+    alphabet=st.characters(blacklist_categories=("Lu", "Ll", "Lt", "Lm", "Lo", "Nd")), max_size=50
+)
+
+
+class TestScrubProperties:
+    """Property-based tests for output scrubbing."""
+
+    @given(secret=_secrets, prefix=_surrounding_text, suffix=_surrounding_text)
+    def test_scrub_preserves_non_secret_content(self, secret, prefix, suffix):
+        """Only the secret itself should be replaced; everything around it is kept."""
+        # A fresh broker per example, so no scrub patterns outlive the test
+        scrubbed = SecretsBroker()._scrub_output(prefix + secret + suffix, {"k": secret})
+
+        assert scrubbed == prefix + "[REDACTED]" + suffix
 
-    def test_uri_format(self):
-        """URI should follow 1Password format."""
-        ref = SecretReference(vault="MyVault", item="MyItem", field="password")
+    @given(secret=_secrets, prefix=_surrounding_text)
+    def test_scrub_catches_case_changes(self, secret, prefix):
+        """Case-shifted copies of a secret should be redacted too."""
+        content = prefix + secret.upper() + prefix + secret.swapcase()
 
-        assert ref.uri == "op://MyVault/MyItem/password"
+        scrubbed = SecretsBroker()._scrub_output(content, {"k": secret})
+
+        assert scrubbed == prefix + "[REDACTED]" + prefix + "[REDACTED]"
+
+
+class TestWarmCache:
+    """Test eager secret fetching for registered tools."""
+
+    def test_fetches_each_unique_secret_once(self):
+        """Secrets shared between tools should only be fetched once."""
+        broker = SecretsBroker()
+        shared = SecretReference(vault="V", item="Shared", field="token")
+        other = SecretReference(vault="V", item="Other", field="api_key")
+        broker.register_tool("tool_a", lambda args, secrets: None, secrets=[shared])
+        broker.register_tool("tool_b", lambda args, secrets: None, secrets=[shared, other])
+
+        fetched = []
+
+        def fake_get_secret(ref):
+            fetched.append(ref.uri)
+            return "value"
+
+        broker._get_secret = fake_get_secret
+
+        assert broker.warm_cache() == 2
+        assert sorted(fetched) == [other.uri, shared.uri]
+
+    def test_failures_are_not_raised(self):
+        """A secret that can't be fetched should not break the warmup."""
+        broker = SecretsBroker()
+        ref = SecretReference(vault="V", item="Missing")
+        broker.register_tool("tool", lambda args, secrets: None, secrets=[ref])
+
+        def failing_get_secret(ref):
+            raise RuntimeError("1Password CLI error")
+
+        broker._get_secret = failing_get_secret
+
+        assert broker.warm_cache() == 0
+
+    def test_registrations_trigger_one_background_warmup(self):
+        """Registering several tools in a row should warm the cache once."""
+        timers: list[_ManualTimer] = []
+
+        def timer_factory(interval, function):
+            timers.append(_ManualTimer(function))
+            return timers[-1]
+
+        broker = SecretsBroker(warm_on_register=True, timer_factory=timer_factory)
+        warmups = []
+        broker.warm_cache = lambda: warmups.append(True)
+
+        broker.register_tool(
+            "tool_a", lambda args, secrets: None, secrets=[SecretReference(vault="V", item="A")]
+        )
+        broker.register_tool(
+            "tool_b", lambda args, secrets: None, secrets=[SecretReference(vault="V", item="B")]
+        )
+        for timer in timers:
+            timer.fire()
+
+        assert [timer.started for timer in timers] == [True, True]
+        assert warmups == [True]
+
+    def test_concurrent_requests_share_one_fetch(self):
+        """Threads asking for the same uncached secret should trigger a single op read."""
+        broker = SecretsBroker()
+        ref = SecretReference(vault="V", item="Shared", field="token")
+        op_calls = []
+        release = threading.Event()
+
+        def slow_run_op(args, input=None):
+            op_calls.append(args)
+            release.wait(timeout=5)
+            return subprocess.CompletedProcess(args, 0, stdout="value\n", stderr="")
+
+        broker._run_op = slow_run_op
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(broker._get_secret, ref) for _ in range(4)]
+            time.sleep(0.05)
+            release.set()
+            values = [future.result() for future in futures]
+
+        assert values == ["value"] * 4
+        assert op_calls == [["read", ref.uri]]
+
+
+class TestBulkResolve:
+    """Test resolving several secrets with one 1Password CLI call."""
+
+    def setup_method(self):
+        """Set up a broker with a two-secret tool and a fake op CLI."""
+        self.broker = SecretsBroker()
+        self.refs = [
+            SecretReference(vault="V", item="Api", field="api_key"),
+            SecretReference(vault="V", item="Api", field="token"),
+        ]
+        self.broker.register_tool("tool", lambda args, secrets: None, secrets=self.refs)
+        self.op_calls: list[list[str]] = []
+
+    def fake_inject(self, returncode=0):
+        """Replace the op CLI with one that resolves each reference to 'value:<uri>'."""
+
+        def run_op(args, input=None):
+            self.op_calls.append(args)
+            stdout = input
+            for ref in self.refs:
+                stdout = stdout.replace(f"{{{{ {ref.uri} }}}}", f"value:{ref.uri}\nline2")
+            return subprocess.CompletedProcess(args, returncode, stdout=stdout, stderr="")
+
+        self.broker._run_op = run_op
+
+    def test_resolves_all_secrets_in_one_call(self):
+        """All uncached secrets should be fetched with a single op inject."""
+        self.fake_inject()
+
+        secrets = self.broker._resolve_secrets("tool")
+
+        assert self.op_calls == [["inject"]]
+        assert secrets == {
+            "api_key": "value:op://V/Api/api_key\nline2",
+            "token": "value:op://V/Api/token\nline2",
+        }
+
+    def test_falls_back_to_individual_reads(self):
+        """A failed bulk call should fall back to reading each secret."""
+        self.fake_inject(returncode=1)
+        self.broker._get_secret = lambda ref: f"single:{ref.field}"
+
+        secrets = self.broker._resolve_secrets("tool")
+
+        assert secrets == {"api_key": "single:api_key", "token": "single:token"}
+
+    def test_failed_reads_are_not_retried(self):
+        """After the bulk call and its fallback fail, each secret should be read only once."""
+        self.fake_inject(returncode=1)
+
+        secrets = self.broker._resolve_secrets("tool")
+
+        assert secrets == {}
+        assert sorted(self.op_calls) == [
+            ["inject"],
+            ["read", "op://V/Api/api_key"],
+            ["read", "op://V/Api/token"],
+        ]
+
+    def test_tool_call_during_warmup_shares_its_fetch(self):
+        """A tool resolving secrets while the warmup fetches them should not call op again."""
+        self.fake_inject()
+        run_op = self.broker._run_op
+        get_secrets_bulk = self.broker._get_secrets_bulk
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_run_op(args, input=None):
+            started.set()
+            release.wait(timeout=5)
+            return run_op(args, input)
+
+        def releasing_bulk(refs):
+            # The tool's own bulk fetch runs while the warmup's op call is held
+            fetched = get_secrets_bulk(refs)
+            release.set()
+            return fetched
+
+        self.broker._run_op = slow_run_op
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            warmup = pool.submit(self.broker.warm_cache)
+            assert started.wait(timeout=5)
+            self.broker._get_secrets_bulk = releasing_bulk
+            resolve = pool.submit(self.broker._resolve_secrets, "tool")
+
+            assert warmup.result() == 2
+            assert resolve.result()["api_key"] == "value:op://V/Api/api_key\nline2"
+        assert self.op_calls == [["inject"]]
+
+
+class TestSecretCache:
+    """Test expiry and eviction in the secret cache."""
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        """Expired secrets should be treated as missing so they are read again."""
+        now = 1000.0
+        monkeypatch.setattr("time.monotonic", lambda: now)
+        cache = SecretCache(maxsize=4, ttl=60)
+        cache["op://V/I/f"] = "value"
+
+        assert cache.get("op://V/I/f") == "value"
+
+        now += 61
+        assert "op://V/I/f" not in cache
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """The cache should never hold more than maxsize secrets."""
+        cache = SecretCache(maxsize=2, ttl=60)
+        cache["a"] = "1"
+        cache["b"] = "2"
+        cache.get("a")
+        cache["c"] = "3"
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+
+class TestSecretReference:
+    """Test secret reference URI generation."""
 
-    def test_default_field(self):
-        """Default field should be 'password'."""
-        ref = SecretReference(vault="V", item="I")
+    @pytest.mark.parametrize(
+        ("kwargs", "expected_uri"),
+        [
+            # URI should follow 1Password format
+            (
+                {"vault": "MyVault", "item": "MyItem", "field": "password"},
+                "op://MyVault/MyItem/password",
+            ),
+            ({"vault": "V", "item": "Api", "field": "api_key"}, "op://V/Api/api_key"),
+            # Default field should be 'password'
+            ({"vault": "V", "item": "I"}, "op://V/I/password"),
+        ],
+    )
+    def test_uri_format(self, kwargs, expected_uri):
+        """The URI should combine vault, item and field (password by default)."""
+        ref = SecretReference(**kwargs)
 
-        assert ref.field == "password"
-        assert ref.uri == "op://V/I/password"
+        assert ref.field == kwargs.get("field", "password")
+        assert ref.uri == expected_uri
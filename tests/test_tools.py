@@ -4,7 +4,9 @@ Tests for tool executors.
 Verifies that tools work correctly and don't leak secrets.
 """
 
-import json
+import orjson
+import pytest
+from pydantic import ValidationError
 
 from secure_tools.tools.executors import (
     execute_get_current_weather,
@@ -16,58 +18,34 @@ from secure_tools.tools.executors import (
 class TestWeatherTool:
     """Test the weather tool executor."""
 
-    def test_mock_mode_without_api_key(self):
-        """Should work in mock mode without API key."""
-        result = execute_get_current_weather(
-            arguments={"location": "Paris", "format": "celsius"},
-            secrets={},  # No API key
-        )
+    @pytest.mark.parametrize(("unit", "symbol"), [("celsius", "°C"), ("fahrenheit", "°F")])
+    def test_mock_mode_without_api_key(self, weather, unit, symbol):
+        """Should work in mock mode without API key, in the requested unit."""
+        result = weather("Paris", unit)
 
         assert result.success is True
-        data = json.loads(result.content)
-        assert "temperature" in data
+        data = orjson.loads(result.content)
+        assert symbol in data["temperature"]
         assert "condition" in data
         assert data["source"] == "mock_data"
 
-    def test_celsius_format(self):
-        """Celsius format should return °C."""
-        result = execute_get_current_weather(
-            arguments={"location": "Paris", "format": "celsius"}, secrets={}
-        )
-
-        data = json.loads(result.content)
-        assert "°C" in data["temperature"]
-
-    def test_fahrenheit_format(self):
-        """Fahrenheit format should return °F."""
-        result = execute_get_current_weather(
-            arguments={"location": "Paris", "format": "fahrenheit"}, secrets={}
-        )
-
-        data = json.loads(result.content)
-        assert "°F" in data["temperature"]
-
-    def test_known_locations_have_weather(self):
+    @pytest.mark.parametrize("loc", ["paris", "london", "tokyo", "new york", "san francisco"])
+    def test_known_locations_have_weather(self, weather, loc):
         """Known locations should return appropriate weather."""
-        locations = ["paris", "london", "tokyo", "new york", "san francisco"]
+        result = weather(loc)
 
-        for loc in locations:
-            result = execute_get_current_weather(
-                arguments={"location": loc, "format": "celsius"}, secrets={}
-            )
-
-            assert result.success is True
-            data = json.loads(result.content)
-            assert data["condition"] != ""
+        assert result.success is True
+        data = orjson.loads(result.content)
+        assert data["condition"] != ""
 
-    def test_api_key_not_in_result(self):
+    def test_api_key_not_in_result(self, assert_not_leaked):
         """API key should never appear in the result."""
         result = execute_get_current_weather(
             arguments={"location": "Paris", "format": "celsius"},
             secrets={"api_key": "secret-test-key-12345"},
         )
 
-        assert "secret-test-key-12345" not in result.content
+        assert_not_leaked(result.content, "secret-test-key-12345")
 
 
 class TestProtectedStatusTool:
@@ -78,26 +56,37 @@ class TestProtectedStatusTool:
         result = execute_get_protected_status(arguments={"project": "test-project"}, secrets={})
 
         assert result.success is True
-        data = json.loads(result.content)
+        data = orjson.loads(result.content)
         assert data["project"] == "test-project"
         assert "status" in data
         assert "protected" in data
 
 
+@pytest.fixture(scope="module")
+def services_result():
+    """The list_available_services result, fetched once for the module."""
+    return execute_list_available_services(arguments={}, secrets={})
+
+
 class TestListServicesTool:
     """Test the list services tool executor."""
 
-    def test_returns_service_list(self):
+    def test_returns_service_list(self, services_result):
         """Should return available services."""
-        result = execute_list_available_services(arguments={}, secrets={})
-
-        assert result.success is True
-        data = json.loads(result.content)
+        assert services_result.success is True
+        data = orjson.loads(services_result.content)
         assert "services" in data
         assert len(data["services"]) > 0
 
-    def test_no_secrets_needed(self):
+    def test_no_secrets_needed(self, services_result):
         """Should work without any secrets."""
+        assert services_result.success is True
+
+    def test_shared_result_is_immutable(self):
+        """The shared result should not be modifiable by callers."""
         result = execute_list_available_services(arguments={}, secrets={})
 
-        assert result.success is True
+        with pytest.raises(ValidationError):
+            result.content = "tampered"
+
+        assert execute_list_available_services(arguments={}, secrets={}) is result